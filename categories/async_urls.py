@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .async_views import AsyncCategoryDetailView, AsyncCategoryListView
+
+urlpatterns = [
+    path("", AsyncCategoryListView.as_view(), name="async-category-list"),
+    path("<slug:slug>/", AsyncCategoryDetailView.as_view(), name="async-category-detail"),
+]
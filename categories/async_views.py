@@ -0,0 +1,42 @@
+from django.shortcuts import aget_object_or_404
+
+from core.cache import acached_response, normalize_params
+from core.concurrency import run_sync
+from core.views import AsyncAPIView
+
+from .serializers import CategorySerializer
+from .services import CACHE_NAMESPACE
+from .views import CategoryDetailMixin, CategoryListMixin
+
+
+class AsyncCategoryListView(CategoryListMixin, AsyncAPIView):
+    async def get(self, request):
+        params = normalize_params(request.query_params)
+        return await acached_response(
+            request,
+            CACHE_NAMESPACE,
+            "list",
+            # Links are absolute and differ from the sync listing's.
+            [("host", request.get_host()), ("path", request.path), *params],
+            build=lambda: run_sync(self.build_list_payload, request),
+            validators=lambda: run_sync(self.get_list_validators, params),
+            render=self.render,
+        )
+
+
+class AsyncCategoryDetailView(CategoryDetailMixin, AsyncAPIView):
+    async def get(self, request, slug):
+        params = normalize_params(request.query_params)
+        return await acached_response(
+            request,
+            CACHE_NAMESPACE,
+            "detail",
+            [("slug", slug), *params],
+            build=lambda: self.abuild_payload(slug),
+            validators=lambda: run_sync(self.get_validators, slug, params),
+            render=self.render,
+        )
+
+    async def abuild_payload(self, slug):
+        category = await aget_object_or_404(self.get_queryset(), slug=slug)
+        return {"data": CategorySerializer(category).data, "errors": None}
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="category",
+            name="categories__slug_9b1a28_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="category",
+            name="categories__created_6b010e_idx",
+        ),
+    ]
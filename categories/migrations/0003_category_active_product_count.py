@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:56
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_active_products(apps, schema_editor):
+    Category = apps.get_model("categories", "Category")
+    Product = apps.get_model("products", "Product")
+    active = (
+        Product.objects.filter(category=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("category")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Category.objects.update(active_product_count=Coalesce(Subquery(active), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0002_drop_duplicate_indexes"),
+        ("products", "0004_product_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="active_product_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_active_products, migrations.RunPython.noop),
+    ]
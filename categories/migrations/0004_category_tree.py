@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_root_paths(apps, schema_editor):
+    # Every existing category becomes a root: its path is its own segment.
+    Category = apps.get_model("categories", "Category")
+    categories = list(Category.objects.only("pk"))
+    for category in categories:
+        category.path = f"{category.pk.hex}/"
+    Category.objects.bulk_update(categories, ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0003_category_active_product_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="children",
+                to="categories.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.CharField(db_index=True, default="", editable=False, max_length=528),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_root_paths, migrations.RunPython.noop),
+    ]
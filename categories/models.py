@@ -1,28 +1,93 @@
 import uuid
 
 from django.db import models
-from slugify import slugify
+
+from core.slugs import save_with_unique_slug
+
+# Levels a tree may have; every level adds one fixed-width path segment.
+MAX_DEPTH = 16
+PATH_SEGMENT_LENGTH = 33
+
+
+def path_segment(pk):
+    return f"{pk.hex}/"
+
+
+class CategoryQuerySet(models.QuerySet):
+    def live(self):
+        """Categories not being deleted; see categories.services.delete_category."""
+        return self.filter(deleted_at__isnull=True)
 
 
 class Category(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     name = models.CharField(max_length=255, unique=True)
-    slug = models.SlugField(unique=True, max_length=255, db_index=True)
+    slug = models.SlugField(unique=True, max_length=255)
+
+    parent = models.ForeignKey(
+        "self", on_delete=models.PROTECT, null=True, blank=True, related_name="children"
+    )
+    # Materialized path: the ids of every ancestor and then this category, as
+    # "<hex>/" segments. A subtree is one prefix range of this index (LIKE
+    # 'prefix%', served by the varchar_pattern_ops index Django adds on
+    # PostgreSQL); see categories.services.move_category for re-pathing.
+    path = models.CharField(
+        max_length=MAX_DEPTH * PATH_SEGMENT_LENGTH, db_index=True, editable=False
+    )
+
+    # Active products in this category, kept in step by the product services
+    # (see categories.services.adjust_product_counts).
+    active_product_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Set when a deletion is queued; the row goes once its products are detached.
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
-    class Meta:
-        indexes = [
-            models.Index(fields=["slug"]),
-            models.Index(fields=["created_at"]),
-        ]
+    objects = CategoryQuerySet.as_manager()
+
+    @property
+    def depth(self):
+        return len(self.path) // PATH_SEGMENT_LENGTH - 1
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        if not self.path:
+            self.path = (self.parent.path if self.parent_id else "") + path_segment(self.pk)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        save = super().save
+        return save_with_unique_slug(self, self.name, lambda: save(*args, **kwargs))
 
     def __str__(self):
         return self.name
+
+
+class CategoryDeletion(models.Model):
+    """Progress of detaching a deleted category's products, kept after the category is gone."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Not a foreign key: the category row is removed when the deletion finishes.
+    category_id = models.UUIDField(db_index=True)
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255)
+    # Products move here instead of losing their category; null when the
+    # target is itself deleted meanwhile.
+    reassign_to = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+
+    products_total = models.PositiveIntegerField(default=0)
+    products_done = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def status(self):
+        return "done" if self.finished_at else "running"
+
+    def __str__(self):
+        return f"Deletion of {self.name}"
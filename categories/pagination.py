@@ -0,0 +1,8 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class CategoryPagination(PageNumberPagination):
+    # Large enough that a sidebar is usually one page.
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -1,12 +1,18 @@
 from rest_framework import serializers
-from slugify import slugify
 
-from .models import Category
+from .models import Category, CategoryDeletion
+from .services import check_parent, create_category, update_category
 
 
 class CategorySerializer(serializers.ModelSerializer):
 
     slug = serializers.CharField(required=False, allow_blank=True)
+    parent = serializers.SlugRelatedField(
+        slug_field="slug",
+        queryset=Category.objects.live(),
+        required=False,
+        allow_null=True,
+    )
 
     class Meta:
         model = Category
@@ -14,12 +20,47 @@ class CategorySerializer(serializers.ModelSerializer):
             "id",
             "name",
             "slug",
+            "parent",
+            "depth",
+            "active_product_count",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "depth", "active_product_count", "created_at", "updated_at"]
+
+    def validate_parent(self, parent):
+        try:
+            check_parent(self.instance, parent)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc)) from exc
+        return parent
 
     def create(self, validated_data):
-        if not validated_data.get("slug"):
-            validated_data["slug"] = slugify(validated_data["name"])
-        return super().create(validated_data)
+        # A blank slug is allocated by Category.save, with collision retries.
+        if not (validated_data.get("slug") or "").strip():
+            validated_data["slug"] = ""
+        return create_category(**validated_data)
+
+    def update(self, instance, validated_data):
+        return update_category(instance, **validated_data)
+
+
+class CategoryDeletionSerializer(serializers.ModelSerializer):
+
+    reassign_to = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+
+    class Meta:
+        model = CategoryDeletion
+        fields = [
+            "id",
+            "category_id",
+            "name",
+            "slug",
+            "reassign_to",
+            "status",
+            "products_total",
+            "products_done",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
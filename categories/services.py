@@ -0,0 +1,196 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Length, Substr
+from django.utils import timezone
+
+from core.cache import invalidate
+from products.models import Product
+
+from .models import MAX_DEPTH, PATH_SEGMENT_LENGTH, Category, CategoryDeletion, path_segment
+from .tasks import detach_category_products
+
+CACHE_NAMESPACE = "categories"
+# Product payloads embed the category name, so category writes orphan them too.
+INVALIDATES = (CACHE_NAMESPACE, "products")
+
+
+def create_category(**validated_data):
+    category = Category.objects.create(**validated_data)
+    invalidate(*INVALIDATES)
+    return category
+
+
+def check_parent(instance, parent):
+    """
+    Raise ValueError if ``instance`` (None when new) cannot sit under ``parent``:
+    a category cannot move into its own subtree, and the tree stays within
+    MAX_DEPTH levels.
+    """
+    if parent is None:
+        return
+    height = 1
+    if instance is not None and instance.path:
+        if parent.path.startswith(instance.path):
+            raise ValueError("A category cannot be moved under itself or its descendants.")
+        deepest = Category.objects.filter(path__startswith=instance.path).aggregate(
+            length=Max(Length("path"))
+        )["length"]
+        height = (deepest - len(instance.path)) // PATH_SEGMENT_LENGTH + 1
+    if parent.depth + 1 + height > MAX_DEPTH:
+        raise ValueError(f"Categories can be nested at most {MAX_DEPTH} levels deep.")
+
+
+def move_category(instance: Category, parent):
+    """
+    Put ``instance`` and its subtree under ``parent`` (None for a root).
+
+    Every descendant is re-pathed by one UPDATE that swaps the old path prefix
+    for the new one; the subtree's rows are locked first, so concurrent moves
+    of overlapping subtrees apply one after the other.
+    """
+    with transaction.atomic():
+        # Read the path under the row lock: a concurrent move above may have changed it.
+        locked = Category.objects.select_for_update().filter(pk=instance.pk)
+        instance.path = locked.values_list("path", flat=True).get()
+        subtree = Category.objects.filter(path__startswith=instance.path)
+        list(subtree.select_for_update().values_list("pk", flat=True))
+        if parent is not None:
+            parent.refresh_from_db(fields=["path"])
+        check_parent(instance, parent)
+
+        old = instance.path
+        new = (parent.path if parent is not None else "") + path_segment(instance.pk)
+        subtree.update(path=Concat(Value(new), Substr("path", len(old) + 1)))
+        instance.parent = parent
+        instance.path = new
+        instance.save(update_fields=["parent", "updated_at"])
+    invalidate(*INVALIDATES)
+    return instance
+
+
+def update_category(instance: Category, **validated_data):
+    if "parent" in validated_data:
+        parent = validated_data.pop("parent")
+        if parent != instance.parent:
+            move_category(instance, parent)
+
+    for attr, value in validated_data.items():
+        setattr(instance, attr, value)
+
+    instance.save()
+    invalidate(*INVALIDATES)
+    return instance
+
+
+def delete_category(instance: Category, reassign_to=None):
+    """
+    Queue ``instance`` for deletion and return the CategoryDeletion tracking it.
+
+    Only the category row is touched here: it is marked deleted and gives up its
+    name and slug, so readers and new categories treat it as gone at once. Its
+    children move up to its parent. detach_category_products then nulls the
+    products' category (or moves them to ``reassign_to``) in bounded chunks and
+    removes the row.
+    """
+    with transaction.atomic():
+        descendants = Category.objects.filter(path__startswith=instance.path).exclude(
+            pk=instance.pk
+        )
+        prefix = instance.parent.path if instance.parent_id else ""
+        descendants.update(path=Concat(Value(prefix), Substr("path", len(instance.path) + 1)))
+        instance.children.update(parent=instance.parent_id)
+
+        deletion = CategoryDeletion.objects.create(
+            category_id=instance.pk,
+            name=instance.name,
+            slug=instance.slug,
+            reassign_to=reassign_to,
+            products_total=instance.products.count(),
+        )
+        # Out of the tree too, so no subtree query ever reaches it.
+        instance.name = instance.slug = f"deleted-{instance.pk.hex}"
+        instance.parent = None
+        instance.path = path_segment(instance.pk)
+        instance.deleted_at = timezone.now()
+        instance.save(update_fields=["name", "slug", "parent", "path", "deleted_at", "updated_at"])
+        transaction.on_commit(lambda: detach_category_products.delay(str(deletion.pk)))
+    invalidate(*INVALIDATES)
+    return deletion
+
+
+def detach_products(deletion: CategoryDeletion, chunk_size):
+    """
+    Null or reassign up to ``chunk_size`` of the deleted category's products in
+    one short transaction. Returns how many moved; 0 when none are left.
+    """
+    target = deletion.reassign_to
+    if target is not None and Category.objects.live().filter(pk=target.pk).exists():
+        target_id = target.pk
+    else:
+        target_id = None
+
+    with transaction.atomic():
+        rows = list(
+            Product.objects.filter(category_id=deletion.category_id)
+            .order_by("pk")
+            .select_for_update()
+            .values_list("pk", "is_active")[:chunk_size]
+        )
+        if not rows:
+            return 0
+        Product.objects.filter(pk__in=[pk for pk, _ in rows]).update(
+            category_id=target_id, updated_at=timezone.now()
+        )
+        if target_id is not None:
+            adjust_product_counts({target_id: sum(is_active for _, is_active in rows)})
+            # Nulling changes nothing readers see; a new category does.
+            invalidate("products")
+        CategoryDeletion.objects.filter(pk=deletion.pk).update(
+            products_done=F("products_done") + len(rows)
+        )
+    return len(rows)
+
+
+def finish_deletion(deletion: CategoryDeletion):
+    """Remove the deleted category's row once its products are detached."""
+    with transaction.atomic():
+        # Anything that slipped in since the last chunk is nulled by SET_NULL.
+        Category.objects.filter(pk=deletion.category_id).delete()
+        deletion.finished_at = timezone.now()
+        deletion.save(update_fields=["finished_at"])
+    invalidate(*INVALIDATES)
+
+
+def adjust_product_counts(deltas):
+    """
+    Apply ``{category_id: delta}`` to ``active_product_count`` with atomic
+    in-database increments, in the caller's transaction. Rows are updated in
+    id order, so concurrent writers lock them in the same order. The count is
+    part of the payload, so ``updated_at`` moves with it.
+    """
+    changed = False
+    now = timezone.now()
+    for category_id, delta in sorted(deltas.items(), key=lambda item: str(item[0])):
+        if category_id is not None and delta:
+            Category.objects.filter(pk=category_id).update(
+                active_product_count=F("active_product_count") + delta, updated_at=now
+            )
+            changed = True
+    if changed:
+        # Category payloads carry the count; product payloads are unaffected.
+        invalidate(CACHE_NAMESPACE)
+
+
+def recount_products():
+    """Recompute every ``active_product_count`` in one statement, e.g. after raw imports."""
+    active = (
+        Product.objects.filter(category=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("category")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Category.objects.annotate(actual=Coalesce(Subquery(active), 0)).exclude(
+        active_product_count=F("actual")
+    ).update(active_product_count=F("actual"), updated_at=timezone.now())
+    invalidate(CACHE_NAMESPACE)
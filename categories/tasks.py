@@ -0,0 +1,27 @@
+from celery import shared_task
+from django.conf import settings
+
+from .models import CategoryDeletion
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 5},
+)
+def detach_category_products(self, deletion_id):
+    # services dispatches this task, so it is imported here.
+    from .services import detach_products, finish_deletion
+
+    deletion = CategoryDeletion.objects.select_related("reassign_to").get(id=deletion_id)
+    if deletion.finished_at:
+        return "Deletion already finished"
+
+    # Each chunk commits on its own, so a retry resumes with what is left.
+    detached = 0
+    while moved := detach_products(deletion, settings.CATEGORY_DELETE_CHUNK_SIZE):
+        detached += moved
+
+    finish_deletion(deletion)
+    return f"Detached {detached} products"
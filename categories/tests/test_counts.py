@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from categories.services import create_category, recount_products
+from products.models import Product
+from products.services import (
+    bulk_create_products,
+    bulk_update_products,
+    create_product,
+    soft_delete_product,
+    update_product,
+)
+
+
+def _counts():
+    return dict(Category.objects.values_list("slug", "active_product_count"))
+
+
+@pytest.mark.django_db
+def test_counts_follow_every_product_write():
+    audio = create_category(name="Audio")
+    video = create_category(name="Video")
+
+    speaker = create_product(name="Speaker", price=10, stock=1, category=audio)
+    create_product(name="Cable", price=1, stock=1, category=audio)
+    create_product(name="Draft", price=1, stock=1, category=audio, is_active=False)
+    assert _counts() == {"audio": 2, "video": 0}
+
+    update_product(speaker, category=video)
+    assert _counts() == {"audio": 1, "video": 1}
+
+    soft_delete_product(speaker)
+    soft_delete_product(speaker)
+    assert _counts() == {"audio": 1, "video": 0}
+
+    created = bulk_create_products(
+        [
+            {"name": "Screen", "price": 5, "stock": 1, "category": video},
+            {"name": "Remote", "price": 5, "stock": 1, "category": video},
+        ]
+    )
+    bulk_update_products([(created[0], {"category": audio}), (speaker, {"is_active": True})])
+    assert _counts() == {"audio": 2, "video": 2}
+
+    recount_products()
+    assert _counts() == {"audio": 2, "video": 2}
+
+
+@pytest.mark.django_db
+def test_stale_instances_do_not_apply_a_delta_twice():
+    audio = create_category(name="Audio")
+    speaker = create_product(name="Speaker", price=10, stock=1, category=audio)
+    create_product(name="Cable", price=1, stock=1, category=audio)
+    first, second = Product.objects.get(pk=speaker.pk), Product.objects.get(pk=speaker.pk)
+
+    soft_delete_product(first)
+    soft_delete_product(second)
+    assert _counts() == {"audio": 1}
+
+    video = create_category(name="Video")
+    update_product(first, is_active=True)
+    # ``second`` still holds is_active=False, but the stored row is active again.
+    bulk_update_products([(second, {"category": video})])
+    assert _counts() == {"audio": 1, "video": 1}
+
+
+@pytest.mark.django_db
+def test_count_changes_move_last_modified():
+    audio = create_category(name="Audio")
+    video = create_category(name="Video")
+    Category.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+    client = APIClient()
+    response = client.get("/api/categories/")
+
+    create_product(name="Speaker", price=10, stock=1, category=audio)
+    revalidated = client.get(
+        "/api/categories/", HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"]
+    )
+    assert revalidated.status_code == 200
+    assert revalidated.data["results"]["data"][0]["active_product_count"] == 1
+
+    # A recount only touches the rows whose count was wrong.
+    Category.objects.filter(pk=audio.pk).update(active_product_count=5)
+    before = Category.objects.get(pk=video.pk).updated_at
+    recount_products()
+    assert _counts() == {"audio": 1, "video": 0}
+    assert Category.objects.get(pk=video.pk).updated_at == before
+
+
+@pytest.mark.django_db
+def test_list_is_paginated_with_counts_in_constant_queries(django_assert_num_queries):
+    categories = [create_category(name=f"Category {index:02}") for index in range(30)]
+    for category in categories:
+        create_product(name="Lamp", price=1, stock=1, category=category)
+    client = APIClient()
+
+    # Validators (aggregate), COUNT and the page, however many categories.
+    with django_assert_num_queries(3):
+        page = client.get("/api/categories/?page_size=20").data
+    assert page["count"] == 30
+    assert len(page["results"]["data"]) == 20
+    assert page["results"]["data"][0]["active_product_count"] == 1
+    assert client.get(page["next"]).data["results"]["data"][-1]["slug"] == "category-29"
+
+    # A new product moves the count, and the cached page is replaced.
+    create_product(name="Desk", price=1, stock=1, category=categories[0])
+    first = client.get("/api/categories/?page_size=20").data["results"]["data"][0]
+    assert first["active_product_count"] == 2
+
+
+# The async view reads through a worker thread, which only sees committed rows.
+@pytest.mark.django_db(transaction=True)
+def test_sync_and_async_lists_do_not_share_cached_links():
+    create_category(name="Audio")
+    create_category(name="Video")
+    client = Client()
+
+    sync = client.get("/api/categories/?page_size=1").json()
+    async_ = client.get("/api/async/categories/?page_size=1").json()
+
+    assert "/api/categories/" in sync["next"]
+    assert "/api/async/categories/" in async_["next"]
@@ -0,0 +1,81 @@
+import pytest
+from rest_framework.test import APIClient
+
+from categories.models import Category, CategoryDeletion
+from categories.services import create_category
+from config.celery import app
+from products.models import Product
+from products.services import create_product
+
+
+@pytest.fixture
+def eager(monkeypatch, settings):
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    settings.CATEGORY_DELETE_CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def audio():
+    audio = create_category(name="Audio")
+    for index in range(5):
+        create_product(name=f"Speaker {index}", price=10, stock=1, category=audio)
+    return audio
+
+
+@pytest.mark.django_db
+def test_deleted_category_is_gone_for_readers_before_its_products_are_detached(audio):
+    client = APIClient()
+    # Cached before the deletion, to check it does not outlive it.
+    assert client.get("/api/products/speaker-0/").data["data"]["category"] == "audio"
+
+    # Without a worker the task never runs: only the category row has changed.
+    response = client.delete("/api/categories/audio/")
+
+    assert response.status_code == 202
+    assert response.data["data"]["status"] == "running"
+    assert response.data["data"]["products_total"] == 5
+    assert Product.objects.filter(category=audio).count() == 5
+
+    assert client.get("/api/categories/audio/").status_code == 404
+    assert client.get("/api/categories/").data["count"] == 0
+    product = client.get("/api/products/speaker-0/").data["data"]
+    assert product["category"] is None and "category_name" not in product
+    rows = client.get("/api/products/?fields=slug,category,category_name").data["results"]["data"]
+    assert rows[0] == {"slug": rows[0]["slug"], "category": None}
+    assert client.get(f"/api/products/?category={audio.id}").status_code == 400
+
+    # The name and slug are free again.
+    response = client.post(
+        "/api/products/", {"name": "Amp", "price": 1, "stock": 1, "category": "audio"}
+    )
+    assert response.status_code == 400
+    assert client.post("/api/categories/", {"name": "Audio"}).data["data"]["slug"] == "audio"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_products_are_nulled_in_chunks_and_the_row_removed(eager, audio):
+    client = APIClient()
+
+    response = client.delete("/api/categories/audio/")
+
+    progress = client.get(response["Location"]).data["data"]
+    assert progress["status"] == "done"
+    assert progress["products_done"] == progress["products_total"] == 5
+    assert not Category.objects.filter(pk=audio.pk).exists()
+    assert Product.objects.filter(category__isnull=True).count() == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_products_can_be_reassigned(eager, audio):
+    video = create_category(name="Video")
+    client = APIClient()
+
+    assert client.delete("/api/categories/audio/?reassign_to=audio").status_code == 400
+    response = client.delete("/api/categories/audio/?reassign_to=video")
+
+    assert response.status_code == 202
+    assert CategoryDeletion.objects.get().reassign_to == video
+    assert Product.objects.filter(category=video).count() == 5
+    video.refresh_from_db()
+    assert video.active_product_count == 5
+    assert client.get("/api/products/speaker-0/").data["data"]["category"] == "video"
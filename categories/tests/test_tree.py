@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from categories.models import MAX_DEPTH, Category
+from categories.services import create_category, delete_category, move_category
+from products.services import create_product
+
+
+def _slugs(response):
+    return sorted(product["slug"] for product in response.data["results"]["data"])
+
+
+@pytest.fixture
+def tree():
+    home = create_category(name="Home")
+    kitchen = create_category(name="Kitchen", parent=home)
+    knives = create_category(name="Knives", parent=kitchen)
+    garden = create_category(name="Garden")
+    for name, category in [
+        ("Rug", home),
+        ("Pan", kitchen),
+        ("Chef knife", knives),
+        ("Hose", garden),
+    ]:
+        create_product(name=name, price=10, stock=1, category=category)
+    return home, kitchen, knives, garden
+
+
+@pytest.mark.django_db
+def test_subtree_filter_is_one_prefix_query(tree):
+    home, kitchen, knives, garden = tree
+    assert knives.path == home.path + kitchen.path[-33:] + knives.path[-33:]
+    assert knives.depth == 2
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as plain:
+        assert _slugs(client.get(f"/api/products/?category={home.id}")) == ["rug"]
+    with CaptureQueriesContext(connection) as subtree:
+        response = client.get(f"/api/products/?category={home.id}&include_descendants=true")
+    assert _slugs(response) == ["chef-knife", "pan", "rug"]
+    # The same queries as a single category, with the subtree as a prefix subquery.
+    assert len(subtree) == len(plain)
+    assert f"LIKE '{home.path}%'" in subtree[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_moving_a_subtree_repaths_every_descendant(tree):
+    home, kitchen, knives, garden = tree
+    client = APIClient()
+
+    response = client.patch(f"/api/categories/{kitchen.slug}/", {"parent": "garden"}, format="json")
+
+    assert response.status_code == 200
+    assert response.data["data"]["parent"] == "garden"
+    knives.refresh_from_db()
+    assert knives.path.startswith(garden.path) and knives.depth == 2
+    assert _slugs(client.get(f"/api/products/?category={garden.id}&include_descendants=true")) == [
+        "chef-knife",
+        "hose",
+        "pan",
+    ]
+
+    move_category(kitchen, None)
+    knives.refresh_from_db()
+    assert knives.depth == 1 and knives.path.startswith(kitchen.path)
+
+
+@pytest.mark.django_db
+def test_cycles_and_overly_deep_trees_are_rejected(tree):
+    home, kitchen, knives, garden = tree
+    client = APIClient()
+
+    response = client.patch(f"/api/categories/{home.slug}/", {"parent": "knives"}, format="json")
+    assert response.status_code == 400
+    assert "parent" in response.data["errors"]
+
+    parent = knives
+    for level in range(MAX_DEPTH - 3):
+        parent = create_category(name=f"Level {level}", parent=parent)
+    response = client.post("/api/categories/", {"name": "Too deep", "parent": parent.slug})
+    assert response.status_code == 400
+    response = client.patch(f"/api/categories/{garden.slug}/", {"parent": parent.slug})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_deleting_a_category_lifts_its_children(tree):
+    home, kitchen, knives, garden = tree
+
+    delete_category(kitchen)
+
+    knives.refresh_from_db()
+    assert knives.parent == home
+    assert knives.path == home.path + knives.path[-33:]
+    assert Category.objects.filter(path__startswith=home.path).count() == 2
+
+
+@pytest.mark.django_db
+def test_include_descendants_only_widens_a_category_filter(tree):
+    home, kitchen, knives, garden = tree
+    client = APIClient()
+
+    assert len(_slugs(client.get("/api/products/?include_descendants=true"))) == 4
+    assert _slugs(
+        client.get(f"/api/products/?category={kitchen.id}&include_descendants=false")
+    ) == ["pan"]
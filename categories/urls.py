@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import CategoryDetailAPIView, CategoryListCreateAPIView
+from .views import CategoryDeletionAPIView, CategoryDetailAPIView, CategoryListCreateAPIView
 
 urlpatterns = [
     path("", CategoryListCreateAPIView.as_view(), name="category-list-create"),
+    path("deletions/<uuid:pk>/", CategoryDeletionAPIView.as_view(), name="category-deletion"),
     path("<slug:slug>/", CategoryDetailAPIView.as_view(), name="category-detail"),
 ]
@@ -1,35 +1,102 @@
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, inline_serializer
+from django.urls import reverse
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Category
-from .serializers import CategorySerializer
+from core.cache import cached_response, get_generation, normalize_params
+from core.conditional import make_etag
 
+from .models import Category, CategoryDeletion
+from .pagination import CategoryPagination
+from .serializers import CategoryDeletionSerializer, CategorySerializer
+from .services import CACHE_NAMESPACE, delete_category
 
-class CategoryListCreateAPIView(APIView):
 
+class CategoryListMixin:
+    """Pagination, payload and validators of the category listing, sync and async."""
+
+    pagination_class = CategoryPagination
+
+    def get_queryset(self):
+        return Category.objects.live().select_related("parent").order_by("name")
+
+    def build_list_payload(self, request):
+        # Product counts are a column, so a page is one query (plus the COUNT).
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(self.get_queryset(), request)
+        data = CategorySerializer(page, many=True).data
+        return paginator.get_paginated_response({"data": data, "errors": None}).data
+
+    def get_list_validators(self, params):
+        stats = Category.objects.live().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        # Product writes move the counts and updated_at together (see
+        # categories.services.adjust_product_counts).
+        etag = make_etag(
+            "category-list",
+            get_generation(CACHE_NAMESPACE),
+            params,
+            stats["last_modified"],
+            stats["count"],
+        )
+        return etag, stats["last_modified"]
+
+
+class CategoryDetailMixin:
     def get_queryset(self):
-        return Category.objects.all().order_by("name")
+        return Category.objects.live().select_related("parent")
+
+    def get_validators(self, slug, params):
+        row = self.get_queryset().filter(slug=slug).values_list("id", "updated_at").first()
+        if row is None:
+            return None
+
+        pk, updated_at = row
+        etag = make_etag("category", pk, get_generation(CACHE_NAMESPACE), updated_at, params)
+        return etag, updated_at
+
+
+class CategoryListCreateAPIView(CategoryListMixin, APIView):
 
     @extend_schema(
         summary="List Categories",
+        parameters=[
+            OpenApiParameter("page", int),
+            OpenApiParameter("page_size", int),
+        ],
         responses={
             200: inline_serializer(
                 name="CategoryListResponse",
                 fields={
-                    "data": CategorySerializer(many=True),
-                    "errors": serializers.DictField(allow_null=True, required=False),
+                    "count": serializers.IntegerField(),
+                    "next": serializers.URLField(allow_null=True),
+                    "previous": serializers.URLField(allow_null=True),
+                    "results": inline_serializer(
+                        name="CategoryListResults",
+                        fields={
+                            "data": CategorySerializer(many=True),
+                            "errors": serializers.DictField(allow_null=True, required=False),
+                        },
+                    ),
                 },
             )
         },
     )
     def get(self, request):
-        queryset = self.get_queryset()
-        serializer = CategorySerializer(queryset, many=True)
-
-        return Response({"data": serializer.data, "errors": None})
+        params = normalize_params(request.query_params)
+        return cached_response(
+            request,
+            CACHE_NAMESPACE,
+            "list",
+            # Pagination links are absolute, so the host is part of the key.
+            [("host", request.get_host()), *params],
+            build=lambda: self.build_list_payload(request),
+            validators=lambda: self.get_list_validators(params),
+        )
 
     @extend_schema(
         summary="Create Category",
@@ -67,10 +134,7 @@ class CategoryListCreateAPIView(APIView):
         )
 
 
-class CategoryDetailAPIView(APIView):
-
-    def get_queryset(self):
-        return Category.objects.all()
+class CategoryDetailAPIView(CategoryDetailMixin, APIView):
 
     def get_object(self, slug):
         queryset = self.get_queryset()
@@ -89,10 +153,15 @@ class CategoryDetailAPIView(APIView):
         },
     )
     def get(self, request, slug):
-        category = self.get_object(slug)
-        serializer = CategorySerializer(category)
-
-        return Response({"data": serializer.data, "errors": None})
+        params = normalize_params(request.query_params)
+        return cached_response(
+            request,
+            CACHE_NAMESPACE,
+            "detail",
+            [("slug", slug), *params],
+            build=lambda: {"data": CategorySerializer(self.get_object(slug)).data, "errors": None},
+            validators=lambda: self.get_validators(slug, params),
+        )
 
     @extend_schema(
         summary="Update Category",
@@ -171,22 +240,79 @@ class CategoryDetailAPIView(APIView):
 
     @extend_schema(
         summary="Delete Category",
+        description=(
+            "Queues the deletion and returns at once; the category is gone for readers "
+            "immediately, while its products are detached in the background. Poll the "
+            "Location header for progress."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "reassign_to",
+                str,
+                description="Slug of a category to move the products to, instead of none",
+            ),
+        ],
         responses={
-            204: inline_serializer(
+            202: inline_serializer(
                 name="CategoryDeleteResponse",
                 fields={
-                    "data": serializers.DictField(allow_null=True, required=False),
+                    "data": CategoryDeletionSerializer(),
                     "errors": serializers.DictField(allow_null=True, required=False),
                     "message": serializers.CharField(),
                 },
-            )
+            ),
+            400: inline_serializer(
+                name="CategoryDeleteErrorResponse",
+                fields={
+                    "data": serializers.DictField(allow_null=True, required=False),
+                    "errors": serializers.DictField(),
+                },
+            ),
         },
     )
     def delete(self, request, slug):
         category = self.get_object(slug)
-        category.delete()
 
+        reassign_to = None
+        target = request.query_params.get("reassign_to")
+        if target:
+            reassign_to = self.get_queryset().filter(slug=target).exclude(pk=category.pk).first()
+            if reassign_to is None:
+                return Response(
+                    {"data": None, "errors": {"reassign_to": [f"No other category {target!r}."]}},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        deletion = delete_category(category, reassign_to=reassign_to)
         return Response(
-            {"data": None, "errors": None, "message": "Category deleted successfully"},
-            status=status.HTTP_204_NO_CONTENT,
+            {
+                "data": CategoryDeletionSerializer(deletion).data,
+                "errors": None,
+                "message": "Category deletion queued",
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": request.build_absolute_uri(
+                    reverse("category-deletion", args=[deletion.pk])
+                )
+            },
         )
+
+
+class CategoryDeletionAPIView(APIView):
+
+    @extend_schema(
+        summary="Get Category Deletion Progress",
+        responses={
+            200: inline_serializer(
+                name="CategoryDeletionResponse",
+                fields={
+                    "data": CategoryDeletionSerializer(),
+                    "errors": serializers.DictField(allow_null=True, required=False),
+                },
+            )
+        },
+    )
+    def get(self, request, pk):
+        deletion = get_object_or_404(CategoryDeletion.objects.select_related("reassign_to"), pk=pk)
+        return Response({"data": CategoryDeletionSerializer(deletion).data, "errors": None})
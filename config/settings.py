@@ -17,6 +17,7 @@ import sys
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_filters",
     "drf_spectacular",
@@ -55,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its total covers every other middleware.
+    "core.timing.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,6 +108,88 @@ else:
     # Normal environment (Docker / Production)
     DATABASES = {"default": env.db()}
 
+# "web" (gunicorn) or "worker" (Celery); picks the connection pool defaults below.
+PROCESS_TYPE = env("PROCESS_TYPE", default="web")
+
+# On PostgreSQL each process keeps a psycopg pool of DB_POOL_MIN_SIZE..MAX_SIZE
+# connections. Web processes serve threaded async views, Celery processes run
+# one task at a time. With DB_POOL=false connections persist for
+# DB_CONN_MAX_AGE seconds instead. Either way they are health-checked on reuse.
+DB_POOL_DEFAULTS = {"web": (2, 10), "worker": (1, 2)}
+if PROCESS_TYPE not in DB_POOL_DEFAULTS:
+    raise ImproperlyConfigured(
+        f"PROCESS_TYPE must be one of {', '.join(DB_POOL_DEFAULTS)}, not {PROCESS_TYPE!r}."
+    )
+DB_POOL_MIN_SIZE = env.int("DB_POOL_MIN_SIZE", default=DB_POOL_DEFAULTS[PROCESS_TYPE][0])
+DB_POOL_MAX_SIZE = env.int("DB_POOL_MAX_SIZE", default=DB_POOL_DEFAULTS[PROCESS_TYPE][1])
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    if env.bool("DB_POOL", default=True):
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "name": PROCESS_TYPE,
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            # Seconds a checkout may wait for a free connection.
+            "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+            "max_idle": 300,
+            "max_lifetime": 1800,
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+REDIS_URL = env("REDIS_URL")
+# One bounded pool per process, shared by the cache and direct clients (core.redis).
+REDIS_MAX_CONNECTIONS = env.int("REDIS_MAX_CONNECTIONS", default=50)
+# Seconds to wait for a free pooled connection before raising.
+REDIS_POOL_TIMEOUT = env.float("REDIS_POOL_TIMEOUT", default=5.0)
+REDIS_SOCKET_TIMEOUT = env.float("REDIS_SOCKET_TIMEOUT", default=5.0)
+
+if IS_TESTING:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {"pool_class": "core.redis.SharedPool"},
+        }
+    }
+
+# One structured log line per request from core.timing (Server-Timing is always sent).
+REQUEST_TIMING_LOG = env.bool("REQUEST_TIMING_LOG", default=True)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core.timing": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
+# Deadline for each readiness check, and how long a report is reused.
+HEALTH_CHECK_TIMEOUT = env.float("HEALTH_CHECK_TIMEOUT", default=1.0)
+HEALTH_CHECK_CACHE_TTL = env.int("HEALTH_CHECK_CACHE_TTL", default=10)
+
+# Lifetime of cached API payloads; writes invalidate them earlier.
+API_CACHE_TIMEOUT = env.int("API_CACHE_TIMEOUT", default=300)
+
+# Product listings report PostgreSQL's estimate instead of COUNT(*) above this
+# many rows; counts are shared across pages for PRODUCT_COUNT_CACHE_TIMEOUT.
+PRODUCT_COUNT_ESTIMATE_THRESHOLD = env.int("PRODUCT_COUNT_ESTIMATE_THRESHOLD", default=10000)
+PRODUCT_COUNT_CACHE_TIMEOUT = env.int("PRODUCT_COUNT_CACHE_TIMEOUT", default=60)
+
+# Rows fetched per server-side cursor round trip by /api/products/-/export/.
+PRODUCT_EXPORT_CHUNK_SIZE = env.int("PRODUCT_EXPORT_CHUNK_SIZE", default=2000)
+
+# Largest batch accepted by /api/products/-/bulk/.
+PRODUCT_BULK_MAX_ITEMS = env.int("PRODUCT_BULK_MAX_ITEMS", default=5000)
+
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -159,11 +245,24 @@ STATIC_URL = "static/"
 MEDIA_ROOT = env("MEDIA_ROOT", default=os.path.join(BASE_DIR, "media"))
 MEDIA_URL = env("MEDIA_URL", default="/media/")
 
-CELERY_BROKER_URL = env("REDIS_URL")
-CELERY_RESULT_BACKEND = env("REDIS_URL")
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 
 CELERY_TASK_ACKS_LATE = True
 CELERY_TASK_REJECT_ON_WORKER_LOST = True
 
+# Products detached per transaction when a category is deleted.
+CATEGORY_DELETE_CHUNK_SIZE = env.int("CATEGORY_DELETE_CHUNK_SIZE", default=1000)
+
 THUMBNAIL_SIZE = env.int("THUMBNAIL_SIZE", default=300)
 THUMBNAIL_QUALITY = env.int("THUMBNAIL_QUALITY", default=85)
+# Bounding boxes rendered for srcset; THUMBNAIL_SIZE is always one of them.
+THUMBNAIL_SIZES = sorted(
+    {THUMBNAIL_SIZE, *env.list("THUMBNAIL_SIZES", cast=int, default=[150, 300, 600])}
+)
+# Formats Pillow cannot encode are skipped at render time.
+THUMBNAIL_FORMATS = env.list("THUMBNAIL_FORMATS", default=["jpeg", "webp", "avif"])
+# Uploads over either budget are skipped rather than decoded. Pixels count what
+# would be decoded, i.e. after JPEG draft-mode scaling.
+THUMBNAIL_MAX_BYTES = env.int("THUMBNAIL_MAX_BYTES", default=50 * 1024 * 1024)
+THUMBNAIL_MAX_PIXELS = env.int("THUMBNAIL_MAX_PIXELS", default=40_000_000)
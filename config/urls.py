@@ -13,6 +13,9 @@ urlpatterns = [
     path("", include("core.urls")),
     path("api/products/", include("products.urls")),
     path("api/categories/", include("categories.urls")),
+    # Async (ASGI-native) read endpoints
+    path("api/async/products/", include("products.async_urls")),
+    path("api/async/categories/", include("categories.async_urls")),
     # OpenAPI schema
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     # Swagger UI
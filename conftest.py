@@ -0,0 +1,9 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # LocMemCache outlives the per-test database rollback.
+    cache.clear()
+    yield
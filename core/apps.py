@@ -1,5 +1,27 @@
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+)
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = "core"
+
+    def ready(self):
+        from . import metrics
+        from .db import record_connect
+        from .timing import install_execute_wrapper
+
+        connection_created.connect(record_connect)
+        connection_created.connect(install_execute_wrapper)
+
+        before_task_publish.connect(metrics.stamp_published)
+        task_prerun.connect(metrics.task_started)
+        task_postrun.connect(metrics.task_finished)
+        task_retry.connect(metrics.task_retried)
+        task_failure.connect(metrics.task_failed)
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+from . import metrics, timing
+from .conditional import not_modified, set_validators
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "apicache"
+
+
+def _generation_key(namespace):
+    return f"{KEY_PREFIX}:{namespace}:generation"
+
+
+def normalize_params(query_params, ignore=()):
+    """Sorted ``(key, value)`` pairs with blank values dropped, for stable keys."""
+    return sorted(
+        (key, value)
+        for key in query_params
+        if key not in ignore
+        for value in query_params.getlist(key)
+        if value != ""
+    )
+
+
+def get_generation(namespace):
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so a lost generation key can never roll back to
+        # a value whose entries are still alive.
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(*namespaces):
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate(*namespaces):
+    """
+    Orphan every cached entry in ``namespaces``.
+
+    Inside a transaction the generation is bumped now and again on commit, so a
+    reader that repopulated the cache from pre-commit data is discarded too.
+    """
+    bump_generation(*namespaces)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_generation(*namespaces))
+
+
+def _record(outcome):
+    # In-process counters only: no cache round trip on the lookup path.
+    timing.record_cache(outcome)
+    metrics.observe_cache(outcome)
+
+
+def get_stats():
+    """Hits and misses of this process; /metrics merges every process's."""
+    hits = metrics.cache_lookups("hit")
+    misses = metrics.cache_lookups("miss")
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def _entry_key(namespace, kind, params):
+    digest = hashlib.sha1(urlencode(params).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{namespace}:{get_generation(namespace)}:{kind}:{digest}"
+
+
+def lookup(namespace, kind, params):
+    """
+    Return ``(key, entry)`` for ``params`` under the namespace's generation.
+
+    Entries live under the current generation, so invalidation is a single
+    counter bump rather than a key scan. ``key`` is None when the cache is
+    unreachable, which degrades callers to uncached reads.
+    """
+    try:
+        key = _entry_key(namespace, kind, params)
+        entry = cache.get(key)
+    except Exception:
+        logger.warning("API cache unavailable, serving %s:%s uncached", namespace, kind)
+        return None, None
+
+    _record("miss" if entry is None else "hit")
+    return key, entry
+
+
+def store(key, entry):
+    if key is not None:
+        cache.set(key, entry, settings.API_CACHE_TIMEOUT)
+
+
+def cached_value(namespace, kind, params, compute, timeout):
+    """
+    Get-or-compute a value under the namespace's generation, for parts of a
+    response (like a total count) shared by many cached payloads.
+
+    Not counted in the hit/miss stats; an unreachable cache just computes.
+    """
+    try:
+        key = _entry_key(namespace, kind, params)
+        value = cache.get(key)
+    except Exception:
+        logger.warning("API cache unavailable, computing %s:%s uncached", namespace, kind)
+        return compute()
+
+    if value is None:
+        value = compute()
+        try:
+            cache.set(key, value, timeout)
+        except Exception:
+            pass
+    return value
+
+
+def cached_response(request, namespace, kind, params, build, validators):
+    """
+    Serve a GET from the cache with ETag/Last-Modified validation.
+
+    ``validators`` returns ``(etag, last_modified)`` from a cheap query, or None
+    when the resource is missing; it only runs on a cache miss, because cached
+    entries carry their validators. A matching If-None-Match/If-Modified-Since
+    answers 304 before ``build`` serializes anything.
+    """
+    key, entry = lookup(namespace, kind, params)
+
+    if entry is None:
+        resolved = validators()
+        if resolved is None:
+            with timing.serializing():
+                return Response(build())
+        etag, last_modified = resolved
+    else:
+        etag, last_modified = entry["etag"], entry["last_modified"]
+
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    if entry is None:
+        with timing.serializing():
+            payload = build()
+        entry = {"etag": etag, "last_modified": last_modified, "payload": payload}
+        store(key, entry)
+
+    return set_validators(Response(entry["payload"]), etag, last_modified)
+
+
+async def acached_response(request, namespace, kind, params, build, validators, render):
+    """
+    Async ``cached_response``: ``build`` and ``validators`` are coroutine
+    functions and ``render(payload)`` makes the HttpResponse.
+
+    On a miss for an unconditional request, nothing can short-circuit the
+    build, so the validators and the payload are computed concurrently.
+    """
+    key, entry = await sync_to_async(lookup, thread_sensitive=False)(namespace, kind, params)
+
+    if entry is None:
+        conditional = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        if conditional:
+            resolved, payload = await validators(), None
+        else:
+            with timing.serializing():
+                resolved, payload = await asyncio.gather(validators(), build())
+        if resolved is None:
+            if payload is None:
+                with timing.serializing():
+                    payload = await build()
+            return render(payload)
+        etag, last_modified = resolved
+    else:
+        etag, last_modified = entry["etag"], entry["last_modified"]
+
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    if entry is None:
+        if payload is None:
+            with timing.serializing():
+                payload = await build()
+        entry = {"etag": etag, "last_modified": last_modified, "payload": payload}
+        await sync_to_async(store, thread_sensitive=False)(key, entry)
+
+    return set_validators(render(entry["payload"]), etag, last_modified)
@@ -0,0 +1,52 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def _isolated(func):
+    # Worker threads hold their own DB connections; recycle them the way
+    # Django does around a request.
+    def run():
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+
+    return run
+
+
+async def gather_sync(*funcs):
+    """
+    Run blocking callables (ORM queries, cache calls) at the same time.
+
+    Django's async ORM methods funnel every call through one thread per
+    request, so awaiting them together still runs them one after another.
+    Each callable here gets its own worker thread and DB connection instead.
+    """
+    return await asyncio.gather(
+        *(sync_to_async(_isolated(func), thread_sensitive=False)() for func in funcs)
+    )
+
+
+async def run_sync(func, *args, **kwargs):
+    """Await one blocking call on a worker thread with its own DB connection."""
+    (result,) = await gather_sync(lambda: func(*args, **kwargs))
+    return result
+
+
+def shared(factory):
+    """
+    Coroutine function that starts ``factory()`` on first call and lets every
+    caller await the same task.
+    """
+    task = None
+
+    async def get():
+        nonlocal task
+        if task is None:
+            task = asyncio.ensure_future(factory())
+        return await task
+
+    return get
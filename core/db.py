@@ -0,0 +1,50 @@
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+# Django-level connects per alias: pool checkouts when pooled, otherwise new
+# server connections (so churn, with persistent connections disabled).
+_connects = Counter()
+
+
+def record_connect(sender, connection, **kwargs):
+    _connects[connection.alias] += 1
+
+
+def _pool_stats(pool):
+    stats = pool.get_stats()
+    checkouts = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": stats.get("pool_size"),
+        "available": stats.get("pool_available"),
+        "waiting": stats.get("requests_waiting", 0),
+        "checkouts": checkouts,
+        "checkouts_queued": stats.get("requests_queued", 0),
+        "checkout_errors": stats.get("requests_errors", 0),
+        "wait_avg_ms": round(wait_ms / checkouts, 3) if checkouts else None,
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+    }
+
+
+def get_stats():
+    """Connection handling for each database in this process; workers report separately."""
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        # Read the class-level registry: connection.pool would create a pool.
+        pool = getattr(type(connection), "_connection_pools", {}).get(alias)
+        databases[alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "connects": _connects[alias],
+            "pool": None if pool is None else _pool_stats(pool),
+        }
+    return {"pid": os.getpid(), "process_type": settings.PROCESS_TYPE, "databases": databases}
@@ -0,0 +1,126 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .redis import get_client as get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Checks whose result holds for every instance, shared through the cache so
+# one ping broadcast answers for the cluster. Everything else is checked by
+# each process: a load balancer must see this instance's own dependencies.
+SHARED_CHECKS = {"celery_worker"}
+# Share of HEALTH_CHECK_TIMEOUT the ping may wait, so that "no worker replied"
+# is reported before the check's deadline passes.
+CELERY_PING_SHARE = 0.8
+
+# A check that overruns its deadline keeps its thread busy without blocking
+# the response.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health")
+_local = {"expires": 0.0, "report": None}
+
+
+def check_database():
+    # Each probe opens and closes its own connection, so idle pool threads
+    # hold none and a probe exercises connecting as well as querying.
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+def check_redis():
+    get_redis_client(settings.CELERY_BROKER_URL).ping()
+
+
+def check_celery_worker():
+    # limit=1 returns on the first reply instead of waiting out the timeout.
+    timeout = settings.HEALTH_CHECK_TIMEOUT * CELERY_PING_SHARE
+    if not current_app.control.ping(timeout=timeout, limit=1):
+        raise RuntimeError("no worker replied")
+
+
+CHECKS = {
+    "database": check_database,
+    "redis": check_redis,
+    "celery_worker": check_celery_worker,
+}
+
+
+def run_checks(timeout, checks=None):
+    """Run ``checks`` (default: all) at once; one that fails or misses ``timeout`` is unhealthy."""
+    if checks is None:
+        checks = CHECKS
+    futures = {name: _executor.submit(check) for name, check in checks.items()}
+    wait(futures.values(), timeout=timeout)
+
+    services = {}
+    for name, future in futures.items():
+        if not future.done():
+            logger.warning("Health check %s timed out after %ss", name, timeout)
+            services[name] = "unhealthy"
+        elif future.exception() is not None:
+            logger.warning("Health check %s failed: %r", name, future.exception())
+            services[name] = "unhealthy"
+        else:
+            services[name] = "healthy"
+    return services
+
+
+def overall_status(services):
+    if all(status == "healthy" for status in services.values()):
+        return "ok"
+    if any(status == "healthy" for status in services.values()):
+        return "degraded"
+    return "error"
+
+
+def _shared_key(name):
+    return f"health:{name}"
+
+
+def get_report():
+    """
+    The readiness report, at most HEALTH_CHECK_CACHE_TTL seconds old.
+
+    Reports are kept per process. SHARED_CHECKS results are also kept in the
+    shared cache, so frequent load-balancer probes across every worker and
+    instance trigger one Celery ping broadcast per TTL. An unreachable cache
+    just means pinging more often.
+    """
+    now = time.monotonic()
+    if _local["report"] is not None and now < _local["expires"]:
+        return _local["report"]
+
+    ttl = settings.HEALTH_CHECK_CACHE_TTL
+    shared_names = [name for name in CHECKS if name in SHARED_CHECKS]
+    try:
+        cached = cache.get_many([_shared_key(name) for name in shared_names])
+    except Exception:
+        cached = {}
+    shared = {
+        name: cached[_shared_key(name)] for name in shared_names if _shared_key(name) in cached
+    }
+
+    fresh = run_checks(
+        settings.HEALTH_CHECK_TIMEOUT,
+        {name: check for name, check in CHECKS.items() if name not in shared},
+    )
+    try:
+        cache.set_many(
+            {_shared_key(name): status for name, status in fresh.items() if name in SHARED_CHECKS},
+            ttl,
+        )
+    except Exception:
+        pass
+
+    services = {name: shared[name] if name in shared else fresh[name] for name in CHECKS}
+    report = {"status": overall_status(services), "services": services}
+    _local.update(report=report, expires=now + ttl)
+    return report
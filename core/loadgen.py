@@ -0,0 +1,255 @@
+"""
+Dependency-free HTTP/1.1 load generator for local benchmarks.
+
+Each worker (an asyncio task, or a thread with ``run_load_threaded``) keeps
+one keep-alive connection and issues requests back to back, so
+``concurrency`` is the number of requests in flight.
+"""
+
+import asyncio
+import http.client
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    method: str
+    path: str
+    body: bytes | None = None
+    label: str = ""
+
+    @classmethod
+    def get(cls, path, label=""):
+        return cls("GET", path, label=label or path)
+
+    @classmethod
+    def post_json(cls, path, payload, label=""):
+        return cls("POST", path, json.dumps(payload).encode(), label=label or f"POST {path}")
+
+
+@dataclass
+class LoadResult:
+    elapsed: float = 0.0
+    latencies: list = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    by_label: dict = field(default_factory=dict)
+    # Responses with a 5xx status, per label.
+    failed_by_label: Counter = field(default_factory=Counter)
+    bytes_received: int = 0
+
+    @property
+    def total(self):
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self):
+        failed = sum(self.errors.values()) + sum(
+            count for status, count in self.statuses.items() if status >= 500
+        )
+        return failed / self.total if self.total else 0.0
+
+    def percentile(self, q, latencies=None):
+        values = sorted(self.latencies if latencies is None else latencies)
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+        return values[index]
+
+    def summary(self):
+        return {
+            "requests": self.total,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": _milliseconds(self.percentile(50)),
+            "p90_ms": _milliseconds(self.percentile(90)),
+            "p99_ms": _milliseconds(self.percentile(99)),
+            "max_ms": _milliseconds(max(self.latencies, default=None)),
+            "statuses": dict(sorted(self.statuses.items())),
+            "errors": dict(self.errors),
+            "by_label": {
+                label: {
+                    "requests": len(values),
+                    "p50_ms": _milliseconds(self.percentile(50, values)),
+                    "p99_ms": _milliseconds(self.percentile(99, values)),
+                    "failed": self.failed_by_label[label],
+                }
+                for label, values in sorted(self.by_label.items())
+            },
+        }
+
+
+class _Connection:
+    def __init__(self, host, port, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.reader = self.writer = None
+
+    async def request(self, request):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        head = [
+            f"{request.method} {request.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        if request.body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(request.body)}"]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + (request.body or b""))
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            size = 0
+            while chunk := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(chunk + 2)
+                size += chunk
+            await self.reader.readline()
+        else:
+            size = int(headers.get("content-length", 0))
+            await self.reader.readexactly(size)
+
+        if headers.get("connection") == "close":
+            self.close()
+        return status, size
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class _Schedule:
+    """Hands out ``requests`` in order, cycled, until ``total`` or the deadline; thread-safe."""
+
+    def __init__(self, base_url, requests, total, duration):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.requests, self.total = requests, total
+        self.deadline = None if duration is None else time.perf_counter() + duration
+        self.issued = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            if self.total is not None and self.issued >= self.total:
+                return None
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                return None
+            request = self.requests[self.issued % len(self.requests)]
+            self.issued += 1
+        if self.prefix:
+            request = LoadRequest(
+                request.method, self.prefix + request.path, request.body, request.label
+            )
+        return request
+
+
+def _record(result, request, latency, status, size):
+    result.latencies.append(latency)
+    result.by_label.setdefault(request.label, []).append(latency)
+    result.statuses[status] += 1
+    if status >= 500:
+        result.failed_by_label[request.label] += 1
+    result.bytes_received += size
+
+
+async def run_load(base_url, requests, concurrency=50, total=None, duration=None, timeout=30):
+    """
+    Replay ``requests`` (a sequence of LoadRequest, cycled) against ``base_url``.
+
+    Stops after ``total`` requests or ``duration`` seconds, whichever comes first.
+    """
+    schedule = _Schedule(base_url, requests, total, duration)
+    result = LoadResult()
+
+    async def worker():
+        connection = _Connection(schedule.host, schedule.port, timeout)
+        try:
+            while (request := schedule.next()) is not None:
+                started = time.perf_counter()
+                try:
+                    status, size = await connection.request(request)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                    result.errors[type(exc).__name__] += 1
+                    connection.close()
+                    continue
+                _record(result, request, time.perf_counter() - started, status, size)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_load_threaded(base_url, requests, concurrency=50, total=None, duration=None, timeout=30):
+    """
+    ``run_load`` with a thread and a blocking ``http.client`` connection per
+    worker, for comparison with (or instead of) the event loop generator.
+    """
+    schedule = _Schedule(base_url, requests, total, duration)
+    result = LoadResult()
+    lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection(schedule.host, schedule.port, timeout=timeout)
+        headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        try:
+            while (request := schedule.next()) is not None:
+                if request.body is not None:
+                    headers["Content-Type"] = "application/json"
+                else:
+                    headers.pop("Content-Type", None)
+                started = time.perf_counter()
+                try:
+                    connection.request(request.method, request.path, request.body, headers)
+                    response = connection.getresponse()
+                    size = len(response.read())
+                except (OSError, http.client.HTTPException) as exc:
+                    with lock:
+                        result.errors[type(exc).__name__] += 1
+                    connection.close()
+                    continue
+                latency = time.perf_counter() - started
+                with lock:
+                    _record(result, request, latency, response.status, size)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadgen import LoadRequest, run_load
+
+DEFAULT_TARGETS = [
+    "wsgi=http://localhost:8000/api/products/",
+    "asgi=http://localhost:8001/api/async/products/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and tail latency of running deployments, e.g. the "
+        "WSGI workers against the ASGI ones, at high concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            dest="targets",
+            metavar="NAME=URL",
+            help=f"Endpoint to load (repeatable). Default: {' '.join(DEFAULT_TARGETS)}",
+        )
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--warmup", type=int, default=200)
+        parser.add_argument(
+            "--query",
+            action="append",
+            default=[],
+            help="Query string appended to each target, cycled (e.g. 'page=2&ordering=price').",
+        )
+        parser.add_argument(
+            "--cache-bust",
+            action="store_true",
+            help="Make every request a cache miss, so the database path is measured.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, targets, concurrency, requests, warmup, query, cache_bust, **options):
+        results = {}
+        for target in targets or DEFAULT_TARGETS:
+            name, sep, url = target.partition("=")
+            if not sep:
+                raise CommandError(f"Expected NAME=URL, got {target!r}")
+
+            mix = self.build_requests(url, query or [""], cache_bust, requests)
+            asyncio.run(run_load(url, mix, concurrency=concurrency, total=warmup))
+            result = asyncio.run(run_load(url, mix, concurrency=concurrency, total=requests))
+            results[name] = result.summary()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, summary in results.items():
+            self.stdout.write(
+                f"{name:>8}: {summary['throughput_rps']:>8} req/s  "
+                f"p50={summary['p50_ms']}ms  p99={summary['p99_ms']}ms  "
+                f"errors={summary['error_rate']:.2%}  statuses={summary['statuses']}"
+            )
+
+    @staticmethod
+    def build_requests(url, queries, cache_bust, count):
+        # Paths are relative to the target URL; run_load prefixes them.
+        mix = []
+        for index in range(count if cache_bust else len(queries)):
+            params = [queries[index % len(queries)]]
+            if cache_bust:
+                params.append(f"_bench={index}")
+            query = "&".join(param for param in params if param)
+            mix.append(LoadRequest.get(f"/?{query}" if query else "/", label="list"))
+        return mix
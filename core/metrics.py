@@ -0,0 +1,154 @@
+"""
+Prometheus metrics for HTTP requests, the API cache and Celery tasks.
+
+With PROMETHEUS_MULTIPROC_DIR set (see deploy/supervisord.conf), every
+gunicorn and Celery process writes its samples to files in that directory and
+/metrics merges them, so a scrape sees the whole container rather than
+whichever worker answered.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TASK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by URL name, method and status.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "DB queries per request.",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in DB queries per request.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter("api_cache_lookups_total", "API cache lookups.", ["outcome"])
+
+TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between publishing a task and a worker starting it.",
+    ["task"],
+    buckets=TASK_BUCKETS,
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Task run time.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_RETRIES = Counter("celery_task_retries_total", "Task retries.", ["task"])
+TASK_FAILURES = Counter("celery_task_failures_total", "Tasks that failed for good.", ["task"])
+
+PUBLISHED_AT_HEADER = "published_at"
+
+
+def observe_request(route, method, status, values):
+    REQUEST_DURATION.labels(route, method, status).observe(values["total_ms"] / 1000)
+    REQUEST_DB_QUERIES.labels(route).observe(values["db_queries"])
+    REQUEST_DB_DURATION.labels(route).observe(values["db_ms"] / 1000)
+
+
+def observe_cache(outcome):
+    CACHE_LOOKUPS.labels(outcome).inc()
+
+
+def cache_lookups(outcome):
+    """This process's API cache lookups with ``outcome``."""
+    return int(REGISTRY.get_sample_value("api_cache_lookups_total", {"outcome": outcome}) or 0)
+
+
+# Celery signal receivers (connected in CoreConfig.ready).
+
+_started = {}
+
+
+def stamp_published(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+def task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = time.monotonic()
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - published_at))
+
+
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.monotonic() - started)
+
+
+def task_retried(sender=None, **kwargs):
+    TASK_RETRIES.labels(sender.name).inc()
+
+
+def task_failed(sender=None, **kwargs):
+    TASK_FAILURES.labels(sender.name).inc()
+
+
+class CacheRatioCollector:
+    """
+    ``source``'s metrics plus api_cache_hit_ratio, computed from the
+    api_cache_lookups_total samples among them: the whole container's with
+    the multiprocess collector, one pass over the files.
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        lookups = {}
+        for family in self.source.collect():
+            for sample in family.samples:
+                if sample.name == "api_cache_lookups_total":
+                    outcome = sample.labels["outcome"]
+                    lookups[outcome] = lookups.get(outcome, 0) + sample.value
+            yield family
+
+        total = sum(lookups.values())
+        if total:
+            yield GaugeMetricFamily(
+                "api_cache_hit_ratio",
+                "API cache hits over lookups, all processes.",
+                lookups.get("hit", 0) / total,
+            )
+
+
+class _ProcessRegistry:
+    """The default registry, for a single process without a multiprocess directory."""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def render():
+    """``(body, content_type)`` for a scrape."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        source = MultiProcessCollector(None)
+    else:
+        source = _ProcessRegistry()
+    registry = CollectorRegistry()
+    registry.register(CacheRatioCollector(source))
+    return generate_latest(registry), CONTENT_TYPE_LATEST
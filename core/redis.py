@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import redis
+from django.conf import settings
+
+_pools = {}
+_clients = {}
+_lock = threading.Lock()
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Bounded pool that records how hard it is being used.
+
+    Callers wait up to ``timeout`` for a free connection instead of opening
+    more than ``max_connections``. Like every redis-py pool it notices a fork
+    on next use and starts over with fresh connections (and fresh stats), so
+    a pool created before gunicorn forks is safe in each worker.
+    """
+
+    def reset(self):
+        super().reset()
+        self._stats_lock = threading.Lock()
+        self.created = self.acquired = self.exhausted = 0
+        self.wait_total = self.wait_max = 0.0
+
+    def make_connection(self):
+        with self._stats_lock:
+            self.created += 1
+        return super().make_connection()
+
+    def get_connection(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as exc:
+            if str(exc) == "No connection available.":
+                with self._stats_lock:
+                    self.exhausted += 1
+            raise
+
+        waited = time.monotonic() - started
+        with self._stats_lock:
+            self.acquired += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return connection
+
+    def get_stats(self):
+        self._checkpid()
+        with self._stats_lock:
+            idle = sum(connection is not None for connection in list(self.pool.queue))
+            return {
+                "max_connections": self.max_connections,
+                "created": self.created,
+                "open": len(self._connections),
+                "in_use": len(self._connections) - idle,
+                "acquired": self.acquired,
+                "exhausted": self.exhausted,
+                "wait_avg_ms": (
+                    round(self.wait_total / self.acquired * 1000, 3) if self.acquired else None
+                ),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+def get_pool(url=None):
+    """The process-wide pool for ``url`` (REDIS_URL by default), created on first use."""
+    url = url or settings.REDIS_URL
+    pool = _pools.get(url)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(url)
+            if pool is None:
+                pool = _pools[url] = InstrumentedConnectionPool.from_url(
+                    url,
+                    max_connections=settings.REDIS_MAX_CONNECTIONS,
+                    timeout=settings.REDIS_POOL_TIMEOUT,
+                    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                )
+    return pool
+
+
+def get_client(url=None):
+    """A ``redis.Redis`` on the shared pool; use this rather than ``redis.from_url``."""
+    url = url or settings.REDIS_URL
+    client = _clients.get(url)
+    if client is None:
+        client = _clients.setdefault(url, redis.Redis(connection_pool=get_pool(url)))
+    return client
+
+
+class SharedPool:
+    """
+    ``pool_class`` for Django's RedisCache, so the cache borrows connections
+    from the shared pool for its URL instead of building its own.
+    """
+
+    @staticmethod
+    def from_url(url, **options):
+        return get_pool(url)
+
+
+def _redact(url):
+    parts = urlsplit(url)
+    if parts.password is None:
+        return url
+    netloc = parts.netloc.replace(f":{parts.password}@", ":***@", 1)
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+def get_stats():
+    """Stats for this process's pools; each worker process has its own."""
+    return {
+        "pid": os.getpid(),
+        "pools": {_redact(url): pool.get_stats() for url, pool in list(_pools.items())},
+    }
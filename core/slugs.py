@@ -0,0 +1,85 @@
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from slugify import slugify
+
+# Room kept under max_length for a "-<counter>" suffix.
+SUFFIX_ROOM = 11
+SAVE_ATTEMPTS = 3
+# Prefixes per lookup query; SQLite caps expression depth at 1000.
+LOOKUP_BATCH = 250
+
+
+def _stem(base, max_length):
+    return base[: max_length - SUFFIX_ROOM]
+
+
+def allocate_slugs(queryset, names, field="slug", reserved=()):
+    """
+    One slug per name, unique within ``queryset`` and within the batch, and
+    distinct from ``reserved`` (slugs the batch sets explicitly).
+
+    Every ``base`` / ``base-<n>`` collision for the whole batch is fetched with
+    prefix queries (served by the slug's LIKE index on PostgreSQL), one per
+    LOOKUP_BATCH distinct names, and free ``-2``, ``-3``... suffixes are picked
+    in memory. A concurrent writer can still claim the same slug, so saves go
+    through save_with_unique_slug.
+    """
+    max_length = queryset.model._meta.get_field(field).max_length
+    bases = [slugify(name)[:max_length] for name in names]
+    if not bases:
+        return []
+
+    stems = {base: _stem(base, max_length) for base in bases}
+    unique = list(stems.items())
+    taken = set(reserved)
+    for start in range(0, len(unique), LOOKUP_BATCH):
+        batch = unique[start : start + LOOKUP_BATCH]
+        lookup = Q(**{f"{field}__in": [base for base, _ in batch]}) | reduce(
+            or_, (Q(**{f"{field}__startswith": f"{stem}-"}) for _, stem in batch)
+        )
+        taken.update(queryset.filter(lookup).values_list(field, flat=True))
+
+    counters = {}
+    for slug in taken:
+        stem, _, suffix = slug.rpartition("-")
+        if suffix.isdigit():
+            counters[stem] = max(counters.get(stem, 1), int(suffix))
+
+    slugs = []
+    for base in bases:
+        slug = base
+        stem = stems[base]
+        # A suffix can itself be taken: another name in the batch may slugify to it.
+        while slug in taken:
+            counters[stem] = counters.get(stem, 1) + 1
+            slug = f"{stem}-{counters[stem]}"
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def allocate_slug(queryset, name, field="slug"):
+    return allocate_slugs(queryset, [name], field)[0]
+
+
+def save_with_unique_slug(instance, name, save, field="slug", attempts=SAVE_ATTEMPTS):
+    """
+    Give ``instance`` a free slug for ``name`` and run ``save()``.
+
+    Nothing is pre-checked: a slug lost to a concurrent writer surfaces as an
+    IntegrityError, and the slug is re-allocated and the save retried. Other
+    integrity errors are raised unchanged.
+    """
+    queryset = type(instance)._default_manager.exclude(pk=instance.pk)
+    for attempt in range(1, attempts + 1):
+        slug = allocate_slug(queryset, name, field)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            if attempt == attempts or not queryset.filter(**{field: slug}).exists():
+                raise
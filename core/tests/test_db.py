@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from core import db
+
+
+@pytest.mark.django_db
+def test_db_stats_report_connects_for_this_process(settings):
+    connection.ensure_connection()
+
+    data = APIClient().get("/stats/db/").data
+
+    default = data["databases"]["default"]
+    assert data["process_type"] == settings.PROCESS_TYPE
+    # The in-memory test database is opened once and never closed.
+    assert default["connects"] >= 1
+    assert (default["vendor"], default["pool"]) == ("sqlite", None)
+
+
+class FakePool:
+    def get_stats(self):
+        return {
+            "pool_min": 2,
+            "pool_max": 10,
+            "pool_size": 3,
+            "pool_available": 1,
+            "requests_num": 4,
+            "requests_queued": 1,
+            "requests_wait_ms": 10,
+            "connections_num": 3,
+        }
+
+
+def test_pool_stats_are_summarised():
+    stats = db._pool_stats(FakePool())
+
+    assert stats["checkouts"] == 4 and stats["wait_avg_ms"] == 2.5
+    assert (stats["connections_opened"], stats["connections_lost"]) == (3, 0)
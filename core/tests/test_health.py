@@ -1,6 +1,15 @@
+import time
+
 import pytest
 from rest_framework.test import APIClient
 
+from core import health
+
+
+@pytest.fixture(autouse=True)
+def fresh_report(monkeypatch):
+    monkeypatch.setitem(health._local, "report", None)
+
 
 @pytest.mark.django_db
 def test_health_endpoint():
@@ -9,3 +18,95 @@ def test_health_endpoint():
 
     assert response.status_code == 200
     assert "status" in response.data
+
+
+def test_database_check_closes_its_connection_even_when_it_fails(monkeypatch):
+    closed = []
+
+    class BrokenConnection:
+        def cursor(self):
+            raise OSError("connection refused")
+
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(health, "connection", BrokenConnection())
+
+    with pytest.raises(OSError):
+        health.check_database()
+    # The pool thread would otherwise hold a connection until its next probe.
+    assert closed == [True]
+
+
+def test_liveness_touches_no_dependencies(monkeypatch):
+    # No django_db mark: any query would fail the test too.
+    calls = []
+    monkeypatch.setattr(health, "CHECKS", {"database": lambda: calls.append(1)})
+
+    response = APIClient().get("/health/live/")
+
+    assert (response.data, calls) == ({"status": "ok"}, [])
+
+
+def test_checks_run_concurrently_with_a_deadline(monkeypatch, settings):
+    settings.HEALTH_CHECK_TIMEOUT = 0.5
+    monkeypatch.setattr(
+        health,
+        "CHECKS",
+        {
+            "a": lambda: time.sleep(0.3),
+            "b": lambda: time.sleep(0.3),
+            "hung": lambda: time.sleep(2),
+        },
+    )
+
+    started = time.monotonic()
+    report = health.get_report()
+
+    assert time.monotonic() - started < 0.9
+    assert report == {
+        "status": "degraded",
+        "services": {"a": "healthy", "b": "healthy", "hung": "unhealthy"},
+    }
+
+
+def test_reports_are_cached_for_the_ttl(monkeypatch, settings):
+    settings.HEALTH_CHECK_CACHE_TTL = 60
+    calls = []
+    monkeypatch.setattr(
+        health,
+        "CHECKS",
+        {
+            "database": lambda: calls.append("database"),
+            "celery_worker": lambda: calls.append("celery"),
+        },
+    )
+
+    health.get_report()
+    health.get_report()
+    # Another process checks its own database but reuses the shared Celery result.
+    monkeypatch.setitem(health._local, "report", None)
+    report = health.get_report()
+
+    # The checks run concurrently, so only the tally is deterministic.
+    assert sorted(calls) == ["celery", "database", "database"]
+    assert report["services"] == {"database": "healthy", "celery_worker": "healthy"}
+
+
+def test_a_replying_worker_is_healthy_well_before_the_deadline(monkeypatch, settings):
+    settings.HEALTH_CHECK_TIMEOUT = 2.0
+    pings = []
+
+    def ping(timeout, limit):
+        pings.append((timeout, limit))
+        return [{"celery@worker": {"ok": "pong"}}]
+
+    monkeypatch.setattr(health.current_app.control, "ping", ping)
+    monkeypatch.setattr(health, "CHECKS", {"celery_worker": health.check_celery_worker})
+
+    started = time.monotonic()
+    report = health.get_report()
+
+    assert time.monotonic() - started < 1
+    assert report["services"] == {"celery_worker": "healthy"}
+    assert pings == [(2.0 * health.CELERY_PING_SHARE, 1)]
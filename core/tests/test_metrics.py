@@ -0,0 +1,102 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from django.test import Client
+from prometheus_client import REGISTRY
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+from core import metrics
+from products.services import create_product
+from products.tasks import generate_thumbnail
+
+TASK = generate_thumbnail.name
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+def test_requests_are_labelled_by_route_method_and_status():
+    create_product(name="Lamp", price=1, stock=1)
+    route = {"route": "product-list-create", "method": "GET", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", **route)
+    misses = _sample("api_cache_lookups_total", outcome="miss")
+    hits = _sample("api_cache_lookups_total", outcome="hit")
+
+    client = Client()
+    client.get("/api/products/")
+    client.get("/api/products/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    assert _sample("http_request_duration_seconds_count", **route) == before + 2
+    assert _sample("http_request_db_queries_count", route="product-list-create") >= 2
+    assert _sample("api_cache_lookups_total", outcome="miss") == misses + 1
+    assert _sample("api_cache_lookups_total", outcome="hit") == hits + 1
+
+    body = response.content.decode()
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route=' in body
+    assert "api_cache_hit_ratio " in body
+
+
+@pytest.mark.django_db
+def test_thumbnail_task_run_time_and_failures():
+    product = create_product(name="Lamp", price=1, stock=1)
+    succeeded = _sample("celery_task_duration_seconds_count", task=TASK, state="SUCCESS")
+    failed = _sample("celery_task_failures_total", task=TASK)
+
+    generate_thumbnail.apply(args=[str(product.id)])
+    assert _sample("celery_task_duration_seconds_count", task=TASK, state="SUCCESS") == (
+        succeeded + 1
+    )
+
+    generate_thumbnail.apply(args=[str(uuid.uuid4())], retries=5)
+    assert _sample("celery_task_failures_total", task=TASK) == failed + 1
+
+
+@pytest.mark.django_db
+def test_retries_are_counted():
+    retried = _sample("celery_task_retries_total", task=TASK)
+
+    generate_thumbnail.apply(args=[str(uuid.uuid4())], retries=4)
+
+    assert _sample("celery_task_retries_total", task=TASK) == retried + 1
+
+
+def test_queue_wait_is_measured_from_the_publish_stamp():
+    headers = {}
+    metrics.stamp_published(headers=headers)
+    # Published two seconds ago.
+    request = SimpleNamespace(published_at=headers["published_at"] - 2)
+    task = SimpleNamespace(name="example", request=request)
+    before = _sample("celery_task_queue_wait_seconds_sum", task="example")
+
+    metrics.task_started(task_id="1", task=task)
+    metrics.task_finished(task_id="1", task=task, state="SUCCESS")
+
+    assert _sample("celery_task_queue_wait_seconds_sum", task="example") - before >= 2
+    assert _sample("celery_task_queue_wait_seconds_bucket", task="example", le="1.0") == 0
+
+
+def test_workers_are_summed_from_the_multiprocess_directory(monkeypatch, tmp_path):
+    # What two gunicorn workers leave behind after counting cache lookups.
+    for pid, lookups in ((101, {"hit": 3, "miss": 3}), (102, {"hit": 4})):
+        values = MmapedDict(str(tmp_path / f"counter_{pid}.db"))
+        for outcome, count in lookups.items():
+            key = mmap_key(
+                "api_cache_lookups_total", "api_cache_lookups_total", ["outcome"], [outcome], ""
+            )
+            values.write_value(key, count, 0)
+        values.close()
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    body, _ = metrics.render()
+
+    assert b'api_cache_lookups_total{outcome="hit"} 7.0' in body
+    # The ratio covers every worker, not just the one answering the scrape.
+    assert b"api_cache_hit_ratio 0.7" in body
+    # This process's own registry is not what gets reported.
+    assert b"http_request_duration_seconds" not in body
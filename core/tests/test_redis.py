@@ -0,0 +1,73 @@
+import os
+
+import pytest
+import redis
+from rest_framework.test import APIClient
+
+from core import redis as shared_redis
+from core.redis import InstrumentedConnectionPool, SharedPool, get_client, get_pool
+
+
+class FakeConnection:
+    def __init__(self, **kwargs):
+        self.pid = os.getpid()
+
+    def connect(self):
+        pass
+
+    def can_read(self):
+        return False
+
+    def disconnect(self):
+        pass
+
+    def should_reconnect(self):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def no_pools(monkeypatch):
+    monkeypatch.setattr(shared_redis, "_pools", {})
+    monkeypatch.setattr(shared_redis, "_clients", {})
+
+
+def test_every_user_shares_one_pool_per_url(settings):
+    assert get_client().connection_pool is get_pool() is get_pool(settings.REDIS_URL)
+    assert SharedPool.from_url(settings.REDIS_URL, parser_class=None) is get_pool()
+    assert get_pool().max_connections == settings.REDIS_MAX_CONNECTIONS
+
+
+def test_pool_is_bounded_and_reports_usage():
+    pool = InstrumentedConnectionPool(
+        max_connections=2, timeout=0.05, connection_class=FakeConnection
+    )
+    first, _ = pool.get_connection(), pool.get_connection()
+    with pytest.raises(redis.ConnectionError):
+        pool.get_connection()
+    pool.release(first)
+
+    stats = pool.get_stats()
+    assert {key: stats[key] for key in ("created", "open", "in_use", "acquired", "exhausted")} == {
+        "created": 2,
+        "open": 2,
+        "in_use": 1,
+        "acquired": 2,
+        "exhausted": 1,
+    }
+    assert stats["wait_max_ms"] >= 0
+
+
+def test_pool_starts_over_in_a_forked_child():
+    pool = InstrumentedConnectionPool(connection_class=FakeConnection)
+    pool.get_connection()
+    pool.pid = -1  # as seen from a child process
+
+    assert pool.get_stats()["created"] == 0
+
+
+def test_stats_endpoint_redacts_passwords():
+    get_pool("redis://:secret@cache.internal:6379/1")
+
+    data = APIClient().get("/stats/redis/").data
+
+    assert list(data["pools"]) == ["redis://:***@cache.internal:6379/1"]
@@ -0,0 +1,73 @@
+import pytest
+from django.db import IntegrityError
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from core import slugs
+from core.slugs import allocate_slugs
+from products.models import Product
+from products.services import create_product
+
+
+@pytest.mark.django_db
+def test_batch_allocation_uses_one_query(django_assert_num_queries):
+    create_product(name="Phone", price=1, stock=1)
+    create_product(name="Phone", price=1, stock=1)
+    create_product(name="Phone Case", price=1, stock=1)
+
+    with django_assert_num_queries(1):
+        allocated = allocate_slugs(Product.objects.all(), ["Phone", "Phone", "Lamp", "Phone Case"])
+
+    assert allocated == ["phone-3", "phone-4", "lamp", "phone-case-2"]
+
+
+@pytest.mark.django_db
+def test_suffixes_skip_slugs_taken_earlier_in_the_batch():
+    create_product(name="Item", price=1, stock=1)
+
+    allocated = allocate_slugs(Product.objects.all(), ["Item 2", "Item", "Item 3", "Item"])
+
+    assert allocated == ["item-2", "item-3", "item-3-2", "item-4"]
+
+
+@pytest.mark.django_db
+def test_large_batches_are_looked_up_in_chunks(django_assert_num_queries):
+    create_product(name="Item 600", price=1, stock=1)
+    names = [f"Item {i}" for i in range(slugs.LOOKUP_BATCH * 3)]
+
+    with django_assert_num_queries(3):
+        allocated = allocate_slugs(Product.objects.all(), names)
+
+    assert allocated[600] == "item-600-2"
+    assert len(set(allocated)) == len(names)
+
+
+@pytest.mark.django_db
+def test_lost_slug_race_is_retried(monkeypatch):
+    create_product(name="Kettle", price=1, stock=1)
+    allocate = slugs.allocate_slug
+    calls = []
+
+    def stale_then_fresh(queryset, name, field="slug"):
+        # The first allocation misses a row committed by a concurrent writer.
+        calls.append(name)
+        return "kettle" if len(calls) == 1 else allocate(queryset, name, field)
+
+    monkeypatch.setattr(slugs, "allocate_slug", stale_then_fresh)
+
+    product = create_product(name="Kettle", price=2, stock=1)
+
+    assert (product.slug, len(calls)) == ("kettle-2", 2)
+
+
+@pytest.mark.django_db
+def test_categories_get_unique_slugs_without_retrying_other_conflicts():
+    client = APIClient()
+
+    first = client.post("/api/categories/", {"name": "Audio"}, format="json")
+    second = client.post("/api/categories/", {"name": "Audio!"}, format="json")
+    assert (first.data["data"]["slug"], second.data["data"]["slug"]) == ("audio", "audio-2")
+
+    # A duplicate name is not a slug collision, so it is raised rather than retried.
+    with pytest.raises(IntegrityError):
+        Category.objects.create(name="Audio")
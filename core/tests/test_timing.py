@@ -0,0 +1,73 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test import Client
+from rest_framework.test import APIClient
+
+from core import timing
+from products.services import create_product
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(timing, "registry", timing.Registry())
+
+
+def _server_timing(response):
+    return dict(
+        re.match(r"(\w+)(.*)", entry.strip()).groups()
+        for entry in response["Server-Timing"].split(",")
+    )
+
+
+@pytest.mark.django_db
+def test_server_timing_reports_queries_and_cache(caplog):
+    caplog.set_level(logging.INFO, logger="core.timing")
+    create_product(name="Lamp", price=1, stock=1)
+    client = APIClient()
+
+    queries = []
+
+    def count(execute, sql, *args):
+        queries.append(sql)
+        return execute(sql, *args)
+
+    # request_started resets connection.queries, so count independently.
+    with connection.execute_wrapper(count):
+        miss = client.get("/api/products/")
+    hit = client.get("/api/products/")
+
+    assert f'desc="{len(queries)} queries"' in _server_timing(miss)["db"]
+    assert _server_timing(miss)["cache"] == ';desc="0 hit 1 miss"'
+    assert _server_timing(hit)["cache"] == ';desc="1 hit 0 miss"'
+    assert set(_server_timing(hit)) == {"total", "db", "serialize", "cache"}
+
+    logged = [r for r in caplog.records if r.name == "core.timing"]
+    assert logged[-1].timing["route"] == "product-list-create"
+    assert logged[-1].timing["response_bytes"] == len(hit.content)
+
+
+@pytest.mark.django_db
+def test_histograms_are_labelled_by_url_name():
+    client = APIClient()
+    client.get("/api/categories/")
+    client.get("/api/categories/")
+    client.get("/no-such-page/")
+
+    snapshot = timing.registry.snapshot()
+
+    assert set(snapshot) == {"category-list-create", "unmatched"}
+    total = snapshot["category-list-create"]["total_ms"]
+    assert total["count"] == 2 and total["buckets"]["+Inf"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_count_queries_from_worker_threads():
+    create_product(name="Lamp", price=1, stock=1)
+
+    response = Client().get("/api/async/products/")
+
+    queries = int(re.search(r'"(\d+) queries"', response["Server-Timing"]).group(1))
+    assert queries >= 3  # page, count and Max(updated_at), each on its own thread
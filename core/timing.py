@@ -0,0 +1,223 @@
+"""
+Per-request timing: total, DB, serialization, cache and response size.
+
+RequestTimingMiddleware opens a RequestMetrics for each request in a context
+variable, which asgiref carries into sync_to_async worker threads. Every DB
+connection gets an execute wrapper (installed once, on connect) that adds to
+the current request's metrics and does nothing outside a request.
+"""
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics as prometheus
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+# Upper bounds per metric; every histogram also has an unbounded last bucket.
+_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BUCKETS = {
+    "total_ms": _MS,
+    "db_ms": _MS,
+    "serialize_ms": _MS,
+    "db_queries": (0, 1, 2, 5, 10, 25, 50, 100),
+    "response_bytes": (1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+}
+UNMATCHED = "unmatched"
+
+
+class RequestMetrics:
+    __slots__ = ("db_queries", "db_time", "serialize_time", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = self.serialize_time = 0.0
+        self.cache_hits = self.cache_misses = 0
+
+
+def timed_execute(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.db_queries += 1
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """``connection_created`` receiver; pooled connections reconnect, so it is idempotent."""
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+def record_cache(outcome):
+    metrics = _current.get()
+    if metrics is not None:
+        if outcome == "hit":
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+@contextmanager
+def serializing():
+    """
+    Count the enclosed block as serialization time, minus the queries it runs
+    (lazy relations, deferred pages). Concurrent async work can overlap it, so
+    the DB part is an estimate there.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started, db_before = time.perf_counter(), metrics.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started - (metrics.db_time - db_before)
+        metrics.serialize_time += max(0.0, elapsed)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        # Cumulative "less than or equal" counts, Prometheus style.
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": buckets}
+
+
+class Registry:
+    """In-process histograms per URL name; each worker process keeps its own."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, values):
+        with self._lock:
+            histograms = self._routes.get(route)
+            if histograms is None:
+                histograms = self._routes[route] = {
+                    name: Histogram(bounds) for name, bounds in BUCKETS.items()
+                }
+            for name, value in values.items():
+                if value is not None and name in histograms:
+                    histograms[name].observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {name: histogram.snapshot() for name, histogram in histograms.items()}
+                for route, histograms in sorted(self._routes.items())
+            }
+
+
+registry = Registry()
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.url_name:
+        return UNMATCHED
+    return match.view_name
+
+
+def _server_timing(values, metrics):
+    return ", ".join(
+        [
+            f"total;dur={values['total_ms']:.1f}",
+            f'db;dur={values["db_ms"]:.1f};desc="{metrics.db_queries} queries"',
+            f"serialize;dur={values['serialize_ms']:.1f}",
+            f'cache;desc="{metrics.cache_hits} hit {metrics.cache_misses} miss"',
+        ]
+    )
+
+
+def _finish(request, response, metrics, started):
+    values = {
+        "total_ms": (time.perf_counter() - started) * 1000,
+        "db_ms": metrics.db_time * 1000,
+        "serialize_ms": metrics.serialize_time * 1000,
+        "db_queries": metrics.db_queries,
+        # Streaming responses are still being produced; their size is unknown here.
+        "response_bytes": None if response.streaming else len(response.content),
+    }
+    route = _route(request)
+    registry.observe(route, values)
+    prometheus.observe_request(route, request.method, response.status_code, values)
+    response["Server-Timing"] = _server_timing(values, metrics)
+
+    if settings.REQUEST_TIMING_LOG:
+        logger.info(
+            "request route=%s method=%s status=%s total_ms=%.1f db_queries=%d db_ms=%.1f "
+            "serialize_ms=%.1f cache_hits=%d cache_misses=%d response_bytes=%s",
+            route,
+            request.method,
+            response.status_code,
+            values["total_ms"],
+            metrics.db_queries,
+            values["db_ms"],
+            values["serialize_ms"],
+            metrics.cache_hits,
+            metrics.cache_misses,
+            values["response_bytes"],
+            extra={"timing": {"route": route, "status": response.status_code, **values}},
+        )
+    return response
+
+
+class RequestTimingMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, started = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return _finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics, started = RequestMetrics(), time.perf_counter()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return _finish(request, response, metrics, started)
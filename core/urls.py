@@ -1,7 +1,21 @@
 from django.urls import path
 
-from .views import HealthCheckAPIView
+from .views import (
+    CacheStatsAPIView,
+    DatabaseStatsAPIView,
+    HealthCheckAPIView,
+    LivenessAPIView,
+    RedisStatsAPIView,
+    RequestStatsAPIView,
+    metrics_view,
+)
 
 urlpatterns = [
     path("health/", HealthCheckAPIView.as_view(), name="health-check"),
+    path("health/live/", LivenessAPIView.as_view(), name="liveness"),
+    path("stats/cache/", CacheStatsAPIView.as_view(), name="cache-stats"),
+    path("stats/redis/", RedisStatsAPIView.as_view(), name="redis-stats"),
+    path("stats/db/", DatabaseStatsAPIView.as_view(), name="db-stats"),
+    path("stats/requests/", RequestStatsAPIView.as_view(), name="request-stats"),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -1,12 +1,20 @@
-import redis
-from celery import current_app
-from django.conf import settings
-from django.db import connection
+from django.http import Http404, HttpResponse
+from django.views import View
 from drf_spectacular.utils import extend_schema, inline_serializer
-from rest_framework import serializers
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .cache import get_stats as get_cache_stats
+from .db import get_stats as get_db_stats
+from .health import get_report as get_health_report
+from .metrics import render as render_metrics
+from .redis import get_stats as get_redis_stats
+from .renderers import FastJSONRenderer
+from .timing import registry as timing_registry
+
 
 class HealthCheckAPIView(APIView):
     authentication_classes = []
@@ -25,51 +33,135 @@ class HealthCheckAPIView(APIView):
         },
     )
     def get(self, request):
-        services = {}
+        return Response(get_health_report())
 
-        # ------------------
-        # Database Check
-        # ------------------
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            services["database"] = "healthy"
-        except Exception:
-            services["database"] = "unhealthy"
-
-        # ------------------
-        # Redis Check
-        # ------------------
-        try:
-            r = redis.from_url(settings.CELERY_BROKER_URL)
-            r.ping()
-            services["redis"] = "healthy"
-        except Exception:
-            services["redis"] = "unhealthy"
-
-        # ------------------
-        # Celery Worker Check
-        # ------------------
+
+class LivenessAPIView(APIView):
+    """Answers as long as the process serves requests; dependencies are /health/'s job."""
+
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="Liveness Probe",
+        responses={
+            200: inline_serializer(
+                name="LivenessResponse", fields={"status": serializers.CharField()}
+            )
+        },
+    )
+    def get(self, request):
+        return Response({"status": "ok"})
+
+
+class CacheStatsAPIView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="API Cache Statistics",
+        responses={
+            200: inline_serializer(
+                name="CacheStatsResponse",
+                fields={
+                    "hits": serializers.IntegerField(),
+                    "misses": serializers.IntegerField(),
+                    "hit_ratio": serializers.FloatField(allow_null=True),
+                },
+            )
+        },
+    )
+    def get(self, request):
+        return Response(get_cache_stats())
+
+
+class RedisStatsAPIView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="Redis Connection Pool Statistics",
+        description="Pools of the worker process that served the request.",
+        responses={
+            200: inline_serializer(
+                name="RedisStatsResponse",
+                fields={
+                    "pid": serializers.IntegerField(),
+                    "pools": serializers.DictField(child=serializers.DictField()),
+                },
+            )
+        },
+    )
+    def get(self, request):
+        return Response(get_redis_stats())
+
+
+class DatabaseStatsAPIView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="Database Connection Statistics",
+        description="Connections and pool usage of the worker process that served the request.",
+        responses={
+            200: inline_serializer(
+                name="DatabaseStatsResponse",
+                fields={
+                    "pid": serializers.IntegerField(),
+                    "process_type": serializers.CharField(),
+                    "databases": serializers.DictField(child=serializers.DictField()),
+                },
+            )
+        },
+    )
+    def get(self, request):
+        return Response(get_db_stats())
+
+
+class RequestStatsAPIView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="Request Timing Histograms",
+        description=(
+            "Per URL name histograms of total, DB and serialization time, query count and "
+            "response size, for the worker process that served the request."
+        ),
+        responses={200: serializers.DictField(child=serializers.DictField())},
+    )
+    def get(self, request):
+        return Response(timing_registry.snapshot())
+
+
+def metrics_view(request):
+    """Prometheus exposition of every process sharing PROMETHEUS_MULTIPROC_DIR."""
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of ``APIView`` for read endpoints.
+
+    Handlers get a DRF ``Request`` (for ``query_params`` and filter backends)
+    and return ``self.render(payload)``; API exceptions and Http404 become the
+    same JSON bodies DRF's exception handler produces. There is no
+    authentication, throttling or content negotiation.
+    """
+
+    renderer = FastJSONRenderer()
+
+    def render(self, payload, status=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(payload), status=status, content_type=self.renderer.media_type
+        )
+
+    async def dispatch(self, request, *args, **kwargs):
         try:
-            inspect = current_app.control.inspect(timeout=1)
-            ping = inspect.ping()
-
-            if ping:
-                services["celery_worker"] = "healthy"
-            else:
-                services["celery_worker"] = "unhealthy"
-
-        except Exception:
-            services["celery_worker"] = "unhealthy"
-
-        # ------------------
-        # Overall Status
-        # ------------------
-        if all(status == "healthy" for status in services.values()):
-            overall_status = "ok"
-        elif any(status == "healthy" for status in services.values()):
-            overall_status = "degraded"
-        else:
-            overall_status = "error"
-
-        return Response({"status": overall_status, "services": services})
+            return await super().dispatch(Request(request), *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            return self.render(detail, status=exc.status_code)
+        except Http404 as exc:
+            return self.render({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
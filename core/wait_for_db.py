@@ -2,7 +2,7 @@ import os
 import time
 
 import django
-import psycopg2
+import psycopg
 from django.conf import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -13,7 +13,7 @@ def wait_for_db():
     db = settings.DATABASES["default"]
     while True:
         try:
-            conn = psycopg2.connect(
+            conn = psycopg.connect(
                 dbname=db["NAME"],
                 user=db["USER"],
                 password=db["PASSWORD"],
@@ -22,6 +22,6 @@ def wait_for_db():
             )
             conn.close()
             break
-        except psycopg2.OperationalError:
+        except psycopg.OperationalError:
             print("Database unavailable, waiting 2 seconds...")
             time.sleep(2)
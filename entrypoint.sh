@@ -11,4 +11,8 @@ echo "Database ready!"
 
 python manage.py migrate
 
+# Metric files from a previous run would be merged into the new totals.
+rm -rf /tmp/prometheus
+mkdir -p /tmp/prometheus
+
 exec supervisord -c deploy/supervisord.conf
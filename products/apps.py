@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProductsConfig(AppConfig):
     name = "products"
+
+    def ready(self):
+        from .search import install_sqlite_fts
+
+        post_migrate.connect(install_sqlite_fts, sender=self)
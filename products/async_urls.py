@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .async_views import AsyncProductDetailView, AsyncProductListView
+
+urlpatterns = [
+    path("", AsyncProductListView.as_view(), name="async-product-list"),
+    path("<slug:slug>/", AsyncProductDetailView.as_view(), name="async-product-detail"),
+]
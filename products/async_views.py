@@ -0,0 +1,99 @@
+import asyncio
+
+from django.db.models import Max
+from django.shortcuts import aget_object_or_404
+from rest_framework import serializers, status
+
+from core.cache import acached_response, get_generation, normalize_params
+from core.concurrency import run_sync, shared
+from core.conditional import make_etag
+from core.views import AsyncAPIView
+
+from .pagination import ProductCursorPagination
+from .selectors import project_products
+from .serializers import ProductRowSerializer, ProductSerializer, get_requested_fields
+from .services import CACHE_NAMESPACE
+from .views import ProductDetailMixin, ProductListMixin
+
+
+class AsyncProductListView(ProductListMixin, AsyncAPIView):
+    async def get(self, request):
+        try:
+            fields = get_requested_fields(request.query_params)
+        except serializers.ValidationError as exc:
+            return self.render({"data": None, "errors": exc.detail}, status.HTTP_400_BAD_REQUEST)
+
+        params = normalize_params(request.query_params)
+        paginator = self.get_paginator(request)
+
+        # Both the payload and the validators need the filtered queryset and
+        # the total; each is computed at most once, and only on a cache miss.
+        filtered = shared(lambda: run_sync(self.filter_queryset, request, self.get_queryset()))
+
+        async def count_filtered():
+            return await run_sync(paginator.get_count, await filtered(), request)
+
+        count = shared(count_filtered)
+
+        return await acached_response(
+            request,
+            CACHE_NAMESPACE,
+            "list",
+            # Links are absolute and differ from the sync listing's.
+            [("host", request.get_host()), ("path", request.path), *params],
+            build=lambda: self.abuild_list_payload(request, fields, filtered, count),
+            validators=lambda: self.aget_list_validators(request, params, filtered, count),
+            render=self.render,
+        )
+
+    async def aget_list_validators(self, request, params, filtered, count):
+        if isinstance(self.get_paginator(request), ProductCursorPagination):
+            return await run_sync(self.get_list_validators, request, params)
+
+        queryset = await filtered()
+        generation, (total, _), stats = await asyncio.gather(
+            run_sync(get_generation, CACHE_NAMESPACE),
+            count(),
+            queryset.aaggregate(last_modified=Max("updated_at")),
+        )
+        last_modified = stats["last_modified"]
+        etag = make_etag("product-list", generation, params, last_modified, total)
+        return etag, last_modified
+
+    async def abuild_list_payload(self, request, fields, filtered, count):
+        queryset = await filtered()
+        serializer = ProductRowSerializer.for_fields(fields)
+
+        paginator = self.get_paginator(request)
+        paginator.project = serializer.project
+        if isinstance(paginator, ProductCursorPagination):
+            rows = await run_sync(paginator.paginate_queryset, queryset, request)
+        else:
+            rows = await paginator.apaginate_queryset(queryset, request, count)
+
+        data = serializer.serialize(rows)
+        return paginator.get_paginated_response({"data": data, "errors": None}).data
+
+
+class AsyncProductDetailView(ProductDetailMixin, AsyncAPIView):
+    async def get(self, request, slug):
+        try:
+            fields = get_requested_fields(request.query_params)
+        except serializers.ValidationError as exc:
+            return self.render({"data": None, "errors": exc.detail}, status.HTTP_400_BAD_REQUEST)
+
+        params = normalize_params(request.query_params)
+        return await acached_response(
+            request,
+            CACHE_NAMESPACE,
+            "detail",
+            [("slug", slug), *params],
+            build=lambda: self.abuild_payload(slug, fields),
+            validators=lambda: run_sync(self.get_validators, slug, params),
+            render=self.render,
+        )
+
+    async def abuild_payload(self, slug, fields):
+        queryset = project_products(self.get_queryset(), fields)
+        product = await aget_object_or_404(queryset, slug=slug)
+        return {"data": ProductSerializer(product, fields=fields).data, "errors": None}
@@ -0,0 +1,353 @@
+"""
+Reproducible API benchmarks against a seeded catalog.
+
+``seed_catalog`` bulk-inserts a deterministic catalog (same seed, same rows,
+ids included). ``run_suite`` replays each scenario in-process through the test
+client and records its latency distribution and query count; write scenarios
+run in a transaction that is rolled back, so the catalog is the same for every
+run. ``compare`` flags scenarios that got slower or issue more queries than a
+saved baseline.
+"""
+
+import json
+import math
+import platform
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from io import BytesIO
+
+import django
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from categories.models import Category, path_segment
+from categories.services import INVALIDATES as CATEGORY_INVALIDATES
+from categories.services import recount_products
+from core.cache import invalidate
+
+from .models import Product
+from .pagination import ProductPagination
+from .search import FTS_TABLE
+from .tasks import generate_thumbnail
+
+ADJECTIVES = "Oak Walnut Brass Linen Copper Marble Ceramic Velvet Rattan Glass Steel Bamboo".split()
+NOUNS = "Lamp Chair Table Shelf Vase Rug Mirror Stool Bench Clock Desk Sofa Cabinet Bowl".split()
+SEED_BATCH = 5000
+# Product columns written by the seeder, in row order; search_vector is left to its trigger.
+SEED_COLUMNS = [
+    "id",
+    "name",
+    "slug",
+    "description",
+    "price",
+    "stock",
+    "category_id",
+    "image",
+    "thumbnail",
+    "renditions",
+    "is_active",
+    "created_at",
+    "updated_at",
+]
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _insert_products(rows):
+    if connection.vendor != "postgresql":
+        Product.objects.bulk_create(Product(**dict(zip(SEED_COLUMNS, row))) for row in rows)
+        return
+    # COPY skips per-row statement and ORM overhead; the search_vector trigger still fires.
+    renditions = SEED_COLUMNS.index("renditions")
+    columns = ", ".join(SEED_COLUMNS)
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {Product._meta.db_table} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                row = list(row)
+                row[renditions] = json.dumps(row[renditions])
+                copy.write_row(row)
+
+
+def seed_catalog(products, categories=50, seed=0, batch_size=SEED_BATCH, flush=False):
+    """
+    Insert ``categories`` categories and ``products`` products in bulk.
+
+    Names repeat (``len(ADJECTIVES) * len(NOUNS)`` distinct ones), and slugs
+    are numbered the way save_with_unique_slug numbers them, so a large
+    catalog has realistic slug collisions. Refuses to touch a catalog that
+    already has products unless ``flush`` deletes every product and category.
+    """
+    if flush:
+        if connection.vendor == "sqlite":
+            # The FTS fallback's delete trigger scans the index once per row; empty it first.
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        Product.objects.all().delete()
+        Category.objects.update(parent=None)
+        Category.objects.all().delete()
+    elif Product.objects.exists():
+        raise CatalogError("The catalog already has products; flush it to reseed.")
+
+    rng = random.Random(seed)
+    category_rows = []
+    for index in range(1, categories + 1):
+        id = _uuid(rng)
+        category_rows.append(
+            Category(
+                id=id, name=f"Category {index}", slug=f"category-{index}", path=path_segment(id)
+            )
+        )
+    Category.objects.bulk_create(category_rows, batch_size=batch_size)
+
+    category_ids = [category.id for category in category_rows]
+    counters = {}
+    now = timezone.now()
+    for start in range(0, products, batch_size):
+        rows = []
+        for _ in range(min(batch_size, products - start)):
+            adjective, noun = rng.choice(ADJECTIVES), rng.choice(NOUNS)
+            base = f"{adjective}-{noun}".lower()
+            counters[base] = counters.get(base, 0) + 1
+            number = counters[base]
+            rows.append(
+                (
+                    _uuid(rng),
+                    f"{adjective} {noun}",
+                    base if number == 1 else f"{base}-{number}",
+                    f"A {adjective.lower()} {noun.lower()} for every room.",
+                    Decimal(rng.randint(100, 100_000)) / 100,
+                    rng.randint(0, 500),
+                    rng.choice(category_ids) if category_ids else None,
+                    "",
+                    "",
+                    {},
+                    rng.random() < 0.95,
+                    now,
+                    now,
+                )
+            )
+        with transaction.atomic():
+            _insert_products(rows)
+    # The rows bypassed the services: count them and drop what they would have invalidated.
+    recount_products()
+    invalidate(*CATEGORY_INVALIDATES)
+    return products
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Identifiers the scenarios request, read from the seeded catalog."""
+
+    products: int
+    last_page: int
+    category_id: uuid.UUID
+    category_slug: str
+    product_slug: str
+    # Prefix of the per-run query parameter that makes uncached reads miss the API
+    # cache, unique per load so earlier runs' entries are never hit.
+    cache_buster: str
+
+    @classmethod
+    def load(cls):
+        category = Category.objects.order_by("slug").first()
+        product = Product.objects.filter(is_active=True).order_by("slug").first()
+        if category is None or product is None:
+            raise CatalogError("The catalog is empty; seed it first.")
+        products = Product.objects.count()
+        return cls(
+            products=products,
+            last_page=max(1, math.ceil(products / ProductPagination.page_size)),
+            category_id=category.id,
+            category_slug=category.slug,
+            product_slug=product.slug,
+            cache_buster=uuid.uuid4().hex[:8],
+        )
+
+
+def _check(response, expected):
+    if response.status_code != expected:
+        raise AssertionError(
+            f"{response.request['REQUEST_METHOD']} {response.request['PATH_INFO']} returned "
+            f"{response.status_code}, expected {expected}: {response.content[:200]!r}"
+        )
+
+
+def _get(path, cached=False):
+    def run(client, catalog, index):
+        url = path.format(catalog=catalog)
+        if not cached:
+            # A fresh query parameter misses the API cache, so the database path is timed.
+            separator = "&" if "?" in url else "?"
+            url = f"{url}{separator}_bench={catalog.cache_buster}-{index}"
+        _check(client.get(url), 200)
+
+    return run
+
+
+def _create(client, catalog, index):
+    # Every name already has thousands of numbered slugs in a large catalog.
+    payload = {"name": "Oak Lamp", "price": "10.00", "stock": 1, "category": catalog.category_slug}
+    _check(client.post("/api/products/", payload, content_type="application/json"), 201)
+
+
+def _update(client, catalog, index):
+    payload = {"price": f"{10 + index}.00", "stock": index}
+    url = f"/api/products/{catalog.product_slug}/"
+    _check(client.patch(url, payload, content_type="application/json"), 200)
+
+
+class _Thumbnail:
+    """Regenerates every rendition of one product per run."""
+
+    def __init__(self):
+        self.product = None
+
+    def __call__(self, client, catalog, index):
+        if self.product is None:
+            buffer = BytesIO()
+            Image.new("RGB", (2400, 1600), (200, 80, 40)).save(buffer, format="JPEG")
+            self.product = Product.objects.create(name="Thumbnail source", price=1, stock=1)
+            self.product.image.save("bench.jpg", ContentFile(buffer.getvalue()))
+        Product.objects.filter(pk=self.product.pk).update(thumbnail="", renditions={})
+        result = generate_thumbnail.apply(args=[str(self.product.pk)])
+        if result.get() != "Thumbnail generated":
+            raise AssertionError(f"generate_thumbnail returned {result.result!r}")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    run: object
+    writes: bool = False
+
+
+def scenarios():
+    return [
+        Scenario("list", _get("/api/products/")),
+        Scenario("list_cached", _get("/api/products/", cached=True)),
+        Scenario(
+            "list_filtered",
+            _get("/api/products/?category={catalog.category_id}&min_price=100&max_price=500"),
+        ),
+        Scenario("list_searched", _get("/api/products/?search=walnut")),
+        Scenario("list_ordered", _get("/api/products/?ordering=-price")),
+        Scenario("list_deep_page", _get("/api/products/?page={catalog.last_page}")),
+        Scenario("detail", _get("/api/products/{catalog.product_slug}/")),
+        Scenario("create_slug_collision", _create, writes=True),
+        Scenario("update", _update, writes=True),
+        Scenario("generate_thumbnail", _Thumbnail(), writes=True),
+    ]
+
+
+def _percentile(values, q):
+    # Nearest rank, as in core.loadgen.
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def summarize(latencies, queries):
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        "runs": len(milliseconds),
+        "mean_ms": round(sum(milliseconds) / len(milliseconds), 3),
+        "p50_ms": round(_percentile(milliseconds, 50), 3),
+        "p90_ms": round(_percentile(milliseconds, 90), 3),
+        "p99_ms": round(_percentile(milliseconds, 99), 3),
+        "max_ms": round(max(milliseconds), 3),
+        "queries": max(queries),
+    }
+
+
+def measure(scenario, catalog, client, runs, warmup):
+    count = 0
+
+    def counter(execute, *args):
+        nonlocal count
+        count += 1
+        return execute(*args)
+
+    latencies, queries = [], []
+    for index in range(warmup + runs):
+        count = 0
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            scenario.run(client, catalog, index)
+            elapsed = time.perf_counter() - started
+        if index >= warmup:
+            latencies.append(elapsed)
+            queries.append(count)
+    return summarize(latencies, queries)
+
+
+def run_suite(runs=30, warmup=3, only=None):
+    """``{scenario: summary}`` for the catalog currently in the database."""
+    catalog = Catalog.load()
+    client = Client()
+    selected = [scenario for scenario in scenarios() if not only or scenario.name in only]
+    results = {}
+
+    for scenario in selected:
+        if not scenario.writes:
+            results[scenario.name] = measure(scenario, catalog, client, runs, warmup)
+
+    media_root = tempfile.mkdtemp(prefix="bench-media-")
+    try:
+        with override_settings(MEDIA_ROOT=media_root), transaction.atomic():
+            for scenario in selected:
+                if scenario.writes:
+                    results[scenario.name] = measure(scenario, catalog, client, runs, warmup)
+            # Writes are measured for their cost, not kept.
+            transaction.set_rollback(True)
+    finally:
+        shutil.rmtree(media_root, ignore_errors=True)
+    return results
+
+
+def environment():
+    return {
+        "created_at": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+    }
+
+
+def compare(current, baseline, threshold, min_delta_ms=0.5):
+    """
+    Regressions of ``current`` against ``baseline`` (both ``{size: {scenario:
+    summary}}``): a p50 or p90 more than ``threshold`` (a fraction) and
+    ``min_delta_ms`` slower, or more queries. Sizes and scenarios missing from
+    either side are skipped.
+    """
+    regressions = []
+    for size, results in current.items():
+        for name, result in results.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            for metric in ("p50_ms", "p90_ms"):
+                old, new = before[metric], result[metric]
+                if new > old * (1 + threshold) and new - old > min_delta_ms:
+                    regressions.append(
+                        f"{size} products, {name}: {metric} {old} -> {new} "
+                        f"(+{(new - old) / old:.0%})"
+                    )
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{size} products, {name}: queries {before['queries']} -> {result['queries']}"
+                )
+    return regressions
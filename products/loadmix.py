@@ -0,0 +1,155 @@
+"""
+Product API traffic for the loadtest command: a synthetic weighted mix built
+from the local catalog, or GET/POST lines replayed from an access log.
+"""
+
+import random
+import re
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from categories.models import Category
+from core.loadgen import LoadRequest
+
+from .models import Product
+from .pagination import ProductPagination
+
+LIST_PATH = "/api/products/"
+DEFAULT_MIX = {"list": 40, "filter": 20, "search": 10, "detail": 25, "create": 5}
+# Parameters that page or sort a listing without filtering it.
+_PAGING = {"page", "page_size", "ordering", "pagination", "cursor", "fields"}
+# Common/combined log format, as written by gunicorn and nginx: ... "GET /path HTTP/1.1" ...
+_REQUEST_LINE = re.compile(r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[\d.]+"')
+SAMPLE_SIZE = 500
+
+
+def parse_mix(value):
+    """``"list=40,detail=25"`` to ``{"list": 40, "detail": 25}``."""
+    mix = {}
+    for part in value.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip()
+        if not sep or name not in DEFAULT_MIX:
+            raise ValueError(
+                f"Expected one of {', '.join(DEFAULT_MIX)} as NAME=WEIGHT, got {part!r}"
+            )
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("At least one weight must be positive.")
+    return mix
+
+
+def classify(method, path):
+    """The mix label of a recorded request."""
+    url = urlsplit(path)
+    if not url.path.startswith(LIST_PATH) or url.path.startswith(f"{LIST_PATH}-/"):
+        return "other"
+    if url.path != LIST_PATH:
+        return "detail"
+    if method == "POST":
+        return "create"
+    params = {key for key, _ in parse_qsl(url.query)}
+    if "search" in params:
+        return "search"
+    return "filter" if params - _PAGING else "list"
+
+
+def _create(index, category_slugs):
+    payload = {"name": f"Load test product {index}", "price": "19.99", "stock": 5}
+    if category_slugs:
+        payload["category"] = category_slugs[index % len(category_slugs)]
+    return LoadRequest.post_json(LIST_PATH, payload, label="create")
+
+
+@dataclass(frozen=True)
+class Targets:
+    """Slugs and search words sampled from the catalog the server is reading."""
+
+    product_slugs: list
+    category_ids: list
+    category_slugs: list
+    words: list
+    pages: int
+
+    @classmethod
+    def load(cls, size=SAMPLE_SIZE):
+        products = list(
+            Product.objects.filter(is_active=True)
+            .order_by("slug")
+            .values_list("slug", "name")[:size]
+        )
+        categories = list(Category.objects.live().order_by("slug").values_list("id", "slug")[:size])
+        return cls(
+            product_slugs=[slug for slug, _ in products],
+            category_ids=[str(id) for id, _ in categories],
+            category_slugs=[slug for _, slug in categories],
+            words=sorted({word.lower() for _, name in products for word in name.split()}),
+            pages=max(1, min(5, Product.objects.count() // ProductPagination.page_size)),
+        )
+
+
+def synthetic_requests(targets, mix, count, seed=0):
+    """
+    ``count`` requests drawn from ``mix`` weights with a seeded RNG, so the same
+    arguments replay the same traffic. Labels the catalog cannot serve (no
+    products for detail, no categories for filter) are dropped from the mix.
+    """
+    mix = dict(mix)
+    if not targets.product_slugs:
+        mix.pop("detail", None)
+        mix.pop("search", None)
+    if not targets.category_ids:
+        mix.pop("filter", None)
+    if not any(mix.values()):
+        raise ValueError("The catalog is empty; nothing in the mix can be requested.")
+
+    rng = random.Random(seed)
+    labels = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    requests = []
+    for index, label in enumerate(labels):
+        if label == "create":
+            requests.append(_create(index, targets.category_slugs))
+            continue
+        if label == "detail":
+            path = f"{LIST_PATH}{rng.choice(targets.product_slugs)}/"
+        else:
+            params = {}
+            if label == "list":
+                params["page"] = rng.randint(1, targets.pages)
+            elif label == "filter":
+                low = rng.randint(0, 500)
+                params.update(
+                    category=rng.choice(targets.category_ids),
+                    min_price=low,
+                    max_price=low + rng.randint(50, 500),
+                )
+            elif label == "search":
+                params["search"] = rng.choice(targets.words)
+            if rng.random() < 0.3:
+                params["ordering"] = rng.choice(["price", "-price", "-created_at"])
+            path = f"{LIST_PATH}?{urlencode(params)}"
+        requests.append(LoadRequest.get(path, label=label))
+    return requests
+
+
+def read_access_log(lines, category_slugs=()):
+    """
+    ``(requests, skipped)`` from access log lines. GETs replay as recorded;
+    logs carry no bodies, so a POST to the listing becomes a synthetic create.
+    Other methods and unparsable lines are counted in ``skipped``.
+    """
+    requests, skipped = [], 0
+    for line in lines:
+        match = _REQUEST_LINE.search(line)
+        if match is None:
+            skipped += 1
+            continue
+        method, path = match["method"], match["path"]
+        label = classify(method, path)
+        if method == "GET":
+            requests.append(LoadRequest.get(path, label=label))
+        elif method == "POST" and label == "create":
+            requests.append(_create(len(requests), list(category_slugs)))
+        else:
+            skipped += 1
+    return requests, skipped
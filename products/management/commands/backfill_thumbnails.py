@@ -0,0 +1,102 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from products.selectors import get_products_missing_thumbnails
+from products.tasks import generate_thumbnail
+
+
+def _render(product_id):
+    try:
+        generate_thumbnail(product_id)
+    except Exception as exc:
+        return f"{product_id}: {exc!r}"
+    return None
+
+
+def _pending_ids(queryset, batch_size):
+    # Keyset over the primary key: each batch is an index range scan, and
+    # products finished meanwhile simply drop out of the filter.
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        ids = [str(pk) for pk in page.values_list("pk", flat=True)[:batch_size]]
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Render thumbnails for products that have an image but none yet, through Celery "
+        "or, with --local, a process pool. Progress is checkpointed after every batch, so "
+        "a stopped run resumes where it left off; --restart rescans from the beginning "
+        "(which also retries earlier failures)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="IDs per checkpoint.")
+        parser.add_argument("--chunk-size", type=int, default=50, help="IDs per Celery task.")
+        parser.add_argument("--local", action="store_true", help="Render in this process.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--rate", type=float, default=0, help="Maximum products per second (0 = unlimited)."
+        )
+        parser.add_argument("--checkpoint", default="backfill_thumbnails.checkpoint")
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint.")
+
+    def handle(self, *args, batch_size, chunk_size, local, workers, rate, **options):
+        checkpoint = Path(options["checkpoint"])
+        if options["restart"]:
+            checkpoint.unlink(missing_ok=True)
+        resume_after = checkpoint.read_text().strip() if checkpoint.exists() else ""
+
+        queryset = get_products_missing_thumbnails()
+        if resume_after:
+            queryset = queryset.filter(pk__gt=resume_after)
+            self.stdout.write(f"Resuming after {resume_after}")
+        total = queryset.count()
+        self.stdout.write(f"{total} products pending")
+
+        pool = None
+        if local and workers > 1:
+            # Forked children must not share the parent's database connections.
+            connections.close_all()
+            pool = ProcessPoolExecutor(workers, initializer=django.setup)
+
+        done = failed = 0
+        started = time.monotonic()
+        try:
+            for ids in _pending_ids(queryset, batch_size):
+                for chunk in batched(ids, chunk_size):
+                    if local:
+                        results = pool.map(_render, chunk) if pool else map(_render, chunk)
+                        errors = [error for error in results if error]
+                        for error in errors:
+                            self.stderr.write(f"Failed {error}")
+                        failed += len(errors)
+                    else:
+                        generate_thumbnail.chunks([(pk,) for pk in chunk], chunk_size).delay()
+                    done += len(chunk)
+
+                    if rate:
+                        time.sleep(max(0.0, started + done / rate - time.monotonic()))
+
+                checkpoint.write_text(ids[-1])
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{done}/{total} {'rendered' if local else 'queued'} "
+                    f"({done / elapsed:.1f}/s, {failed} failed), checkpoint {ids[-1]}"
+                )
+        finally:
+            if pool:
+                pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {done} products, {failed} failed"))
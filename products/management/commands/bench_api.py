@@ -0,0 +1,94 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.benchmarks import (
+    CatalogError,
+    compare,
+    environment,
+    run_suite,
+    scenarios,
+    seed_catalog,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the product API in-process (latency percentiles and query counts per "
+        "scenario), optionally on freshly seeded catalogs of each --sizes, and compare "
+        "against a saved --baseline. Seeding replaces every product and category, so "
+        "run it against a dedicated database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            help="Catalog sizes to seed and time, e.g. 10000 100000 1000000. "
+            "Without it the current catalog is timed.",
+        )
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--flush", action="store_true", help="Allow --sizes to replace an existing catalog."
+        )
+        parser.add_argument("--runs", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="only",
+            choices=[scenario.name for scenario in scenarios()],
+            help="Scenario to run (repeatable). Default: all.",
+        )
+        parser.add_argument("--output", help="Write results to this JSON file.")
+        parser.add_argument("--baseline", help="Results JSON to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed p50/p90 slowdown against the baseline, as a fraction.",
+        )
+
+    def handle(self, *args, sizes, runs, warmup, only, **options):
+        results = {}
+        try:
+            if not sizes:
+                results["current"] = self.run(runs, warmup, only)
+            for index, size in enumerate(sizes or []):
+                started = time.perf_counter()
+                seed_catalog(
+                    size,
+                    options["categories"],
+                    seed=options["seed"],
+                    # Catalogs seeded by this run are always replaced.
+                    flush=options["flush"] or index > 0,
+                )
+                self.stdout.write(f"Seeded {size} products in {time.perf_counter() - started:.1f}s")
+                results[str(size)] = self.run(runs, warmup, only)
+        except CatalogError as exc:
+            raise CommandError(exc) from exc
+
+        report = {"environment": environment(), "runs": runs, "results": results}
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            regressions = compare(results, baseline["results"], options["threshold"])
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def run(self, runs, warmup, only):
+        summaries = run_suite(runs=runs, warmup=warmup, only=only)
+        for name, summary in summaries.items():
+            self.stdout.write(
+                f"{name:>22}: p50={summary['p50_ms']:>9.3f}ms  p90={summary['p90_ms']:>9.3f}ms  "
+                f"p99={summary['p99_ms']:>9.3f}ms  queries={summary['queries']}"
+            )
+        return summaries
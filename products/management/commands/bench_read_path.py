@@ -0,0 +1,95 @@
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from categories.models import Category
+from core.renderers import FastJSONRenderer
+from products.models import Product
+from products.serializers import ProductRowSerializer, ProductSerializer
+
+MODEL_FIELDS = [
+    field
+    for field in Product._meta.concrete_fields
+    if field.name in ProductRowSerializer.for_fields().columns
+]
+MODEL_COLUMNS = [field.attname for field in MODEL_FIELDS]
+
+
+def _rows(count):
+    category_id = uuid.uuid4()
+    now = timezone.now()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Product {i}",
+            "slug": f"product-{i}",
+            "description": "A reasonably sized product description " * 4,
+            "price": Decimal(i) + Decimal("0.99"),
+            "stock": i,
+            "image": f"products/{i}.jpg",
+            "thumbnail": f"thumbnails/{i}.jpg",
+            "renditions": {
+                name: [
+                    {"name": f"thumbnails/{i}_{size}.{name}", "size": size, "width": size}
+                    for size in (150, 300, 600)
+                ]
+                for name in ("jpeg", "webp")
+            },
+            "is_active": True,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            "category": category_id,
+            "category__slug": "lighting",
+            "category__name": "Lighting",
+            "category__deleted_at": None,
+        }
+        for i in range(count)
+    ]
+
+
+def _model_path(rows):
+    category = Category(id=rows[0]["category"], name="Lighting", slug="lighting")
+    products = []
+    for row in rows:
+        values = [row[field.name] for field in MODEL_FIELDS]
+        # from_db is what the ORM calls per row, so hydration is part of the timing.
+        product = Product.from_db("default", MODEL_COLUMNS, values)
+        product.category = category
+        products.append(product)
+    return JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+
+def _row_path(rows):
+    serializer = ProductRowSerializer.for_fields()
+    return FastJSONRenderer().render(serializer.serialize(rows))
+
+
+class Command(BaseCommand):
+    help = "Compare the model serializer and values() fast path on synthetic listing pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, sizes, repeat, **options):
+        for size in sizes:
+            rows = _rows(size)
+            if _model_path(rows) != _row_path(rows):
+                raise AssertionError("Fast path output differs from ProductSerializer")
+
+            number = max(1, 2000 // size)
+            timings = {}
+            for label, path in (("serializer", _model_path), ("fast path", _row_path)):
+                best = min(timeit.repeat(lambda: path(rows), number=number, repeat=repeat))
+                timings[label] = best / number * 1000
+
+            self.stdout.write(
+                f"page_size={size:>5}  serializer={timings['serializer']:8.3f}ms  "
+                f"fast path={timings['fast path']:8.3f}ms  "
+                f"speedup={timings['serializer'] / timings['fast path']:5.1f}x"
+            )
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadgen import run_load, run_load_threaded
+from products.loadmix import DEFAULT_MIX, Targets, parse_mix, read_access_log, synthetic_requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server (e.g. the gunicorn workers on :8000) with a synthetic mix "
+        "of product list/filter/search/detail/create requests built from the local "
+        "catalog, or with the GET/POST lines of an access log, and report throughput, "
+        "latency percentiles and error rates. Creates are real writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:8000")
+        parser.add_argument(
+            "--access-log", help="Replay the requests recorded in this access log instead."
+        )
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+            help="Synthetic mix weights (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--distinct", type=int, default=1000, help="Synthetic requests generated (cycled)."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument(
+            "--duration", type=float, help="Stop after this many seconds, even if requests remain."
+        )
+        parser.add_argument("--warmup", type=int, default=100)
+        parser.add_argument("--mode", choices=["asyncio", "threads"], default="asyncio")
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, url, concurrency, requests, duration, warmup, mode, **options):
+        mix = self.build_mix(options)
+
+        def load(total, duration=None):
+            kwargs = dict(
+                concurrency=concurrency, total=total, duration=duration, timeout=options["timeout"]
+            )
+            if mode == "threads":
+                return run_load_threaded(url, mix, **kwargs)
+            return asyncio.run(run_load(url, mix, **kwargs))
+
+        if warmup:
+            load(warmup)
+        result = load(requests, duration)
+        if not result.latencies and result.errors:
+            raise CommandError(f"No response from {url}: {dict(result.errors)}")
+
+        summary = {"url": url, "mode": mode, "concurrency": concurrency, **result.summary()}
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        self.stdout.write(
+            f"{summary['requests']} requests in {summary['elapsed_s']}s ({mode}, "
+            f"concurrency {concurrency}): {summary['throughput_rps']} req/s  "
+            f"errors={summary['error_rate']:.2%}  statuses={summary['statuses']}"
+        )
+        if summary["errors"]:
+            self.stdout.write(f"transport errors: {summary['errors']}")
+        self.stdout.write(
+            f"latency: p50={summary['p50_ms']}ms  p90={summary['p90_ms']}ms  "
+            f"p99={summary['p99_ms']}ms  max={summary['max_ms']}ms"
+        )
+        for label, values in summary["by_label"].items():
+            self.stdout.write(
+                f"{label:>8}: {values['requests']:>7} requests  p50={values['p50_ms']}ms  "
+                f"p99={values['p99_ms']}ms  5xx={values['failed']}"
+            )
+
+    def build_mix(self, options):
+        targets = Targets.load()
+        if options["access_log"]:
+            with Path(options["access_log"]).open(errors="replace") as lines:
+                mix, skipped = read_access_log(lines, targets.category_slugs)
+            if not mix:
+                raise CommandError(f"No replayable requests in {options['access_log']}")
+            if skipped:
+                self.stderr.write(
+                    f"Skipped {skipped} lines that are neither GETs nor product creates."
+                )
+            return mix
+        try:
+            return synthetic_requests(
+                targets, parse_mix(options["mix"]), options["distinct"], seed=options["seed"]
+            )
+        except ValueError as exc:
+            raise CommandError(exc) from exc
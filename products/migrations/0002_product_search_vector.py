@@ -0,0 +1,72 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_search_vector_update()
+    """,
+    # Fires the trigger to backfill existing rows.
+    "UPDATE products_product SET name = name",
+    "CREATE INDEX product_search_vector_gin ON products_product USING gin (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS product_search_vector_gin",
+    "DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product",
+    "DROP FUNCTION IF EXISTS products_product_search_vector_update()",
+]
+
+
+def _run_on_postgres(statements):
+    # The SQLite FTS5 fallback is (re)installed after every migrate instead,
+    # because SQLite table rebuilds drop triggers; see products.search.
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="product",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="product_search_vector_gin"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    _run_on_postgres(POSTGRES_FORWARD),
+                    _run_on_postgres(POSTGRES_BACKWARD),
+                ),
+            ],
+        ),
+    ]
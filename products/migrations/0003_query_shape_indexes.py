@@ -0,0 +1,70 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0002_drop_duplicate_indexes"),
+        ("products", "0002_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["created_at", "id"], name="product_created_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["created_at", "id"],
+                name="product_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "price", "id"], name="product_category_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["price", "id"], name="product_price_id_idx"),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="products",
+                to="categories.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="products_pr_slug_3edc0c_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="products_pr_created_52f0d7_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="products_pr_updated_150263_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="products_pr_is_acti_ca4d9a_idx",
+        ),
+    ]
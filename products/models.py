@@ -1,5 +1,7 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
 
@@ -8,7 +10,8 @@ class Product(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     name = models.CharField(max_length=255)
-    slug = models.SlugField(unique=True, max_length=255, db_index=True)
+    # The unique constraint is the slug index (plus a LIKE-friendly one on PostgreSQL).
+    slug = models.SlugField(unique=True, max_length=255)
 
     description = models.TextField(blank=True, null=True)
 
@@ -22,22 +25,37 @@ class Product(models.Model):
         null=True,
         blank=True,
         related_name="products",
+        # Served by the (category, price, id) index below.
+        db_index=False,
     )
 
     image = models.ImageField(upload_to="products/", null=True, blank=True)
     thumbnail = models.ImageField(upload_to="thumbnails/", null=True, blank=True)
+    # {format: [{"name", "size", "width", "height"}, ...]}, written by generate_thumbnail.
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     is_active = models.BooleanField(default=True)
 
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
+    # Maintained by a database trigger on PostgreSQL; see products.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         indexes = [
-            models.Index(fields=["slug"]),
-            models.Index(fields=["created_at"]),
-            models.Index(fields=["updated_at"]),
-            models.Index(fields=["is_active"]),
+            # Default listing and keyset pages: ORDER BY created_at, id (either direction).
+            models.Index(fields=["created_at", "id"], name="product_created_id_idx"),
+            models.Index(
+                fields=["created_at", "id"],
+                name="product_active_created_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?category=X&min_price=a&max_price=b&ordering=price
+            models.Index(fields=["category", "price", "id"], name="product_category_price_idx"),
+            # ?ordering=price without a category filter
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
         ]
 
     def __str__(self):
@@ -0,0 +1,307 @@
+import asyncio
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Mapping
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from core.cache import cached_value, normalize_params
+from core.concurrency import run_sync
+
+from .selectors import count_products
+from .services import CACHE_NAMESPACE
+
+
+class ProductPaginator(DjangoPaginator):
+    """
+    Django paginator with a pluggable count and per-page projection.
+
+    ``counter`` returns ``(count, exact)``; with an estimated count every page
+    number is served, since the estimate may be short of the real total.
+    ``project`` reshapes each page's slice, so the COUNT stays free of joins
+    that only the projected columns need.
+    """
+
+    def __init__(self, object_list, per_page, project=None, counter=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.project = project
+        self.counter = counter
+
+    @cached_property
+    def _counted(self):
+        if self.counter is None:
+            return super().count, True
+        return self.counter(self.object_list)
+
+    @property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def count_exact(self):
+        return self._counted[1]
+
+    def validate_lower_bound(self, number):
+        """``validate_number`` without the last-page check, which needs the count."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        return self.validate_lower_bound(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_exact:
+            page = super().page(number)
+        else:
+            bottom = (number - 1) * self.per_page
+            page = Page(self.object_list[bottom : bottom + self.per_page], number, self)
+        if self.project is not None:
+            page.object_list = self.project(page.object_list)
+        return page
+
+
+class ProductPagination(PageNumberPagination):
+    page_size = 10
+
+    # Optional callable applied to the page slice, e.g. a values() projection.
+    project = None
+
+    # Parameters that change neither the matching rows nor their count.
+    count_ignored_params = ("page", "ordering", "fields", "exclude", "format", "pagination")
+
+    def django_paginator_class(self, queryset, page_size):
+        return ProductPaginator(
+            queryset,
+            page_size,
+            project=self.project,
+            counter=lambda queryset: self.get_count(queryset, self.request),
+        )
+
+    def get_count(self, queryset, request):
+        """``(count, exact)`` for the filtered ``queryset``, cached per filter signature."""
+        params = normalize_params(request.query_params, ignore=self.count_ignored_params)
+        return cached_value(
+            CACHE_NAMESPACE,
+            "count",
+            params,
+            lambda: count_products(queryset, settings.PRODUCT_COUNT_ESTIMATE_THRESHOLD),
+            settings.PRODUCT_COUNT_CACHE_TIMEOUT,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, count):
+        """
+        ``paginate_queryset`` for async views: the page is fetched while
+        ``count()``, a coroutine function returning ``(count, exact)``, runs.
+        """
+        self.request = request
+        number = request.query_params.get(self.page_query_param) or 1
+        if number in self.last_page_strings:
+            # The last page's offset depends on the count.
+            return await run_sync(self.paginate_queryset, queryset, request)
+
+        page_size = self.get_page_size(request)
+        paginator = ProductPaginator(queryset, page_size, project=self.project)
+        try:
+            number = paginator.validate_lower_bound(number)
+            bottom = (number - 1) * page_size
+            page = queryset[bottom : bottom + page_size]
+            if self.project is not None:
+                page = self.project(page)
+
+            counted, rows = await asyncio.gather(count(), run_sync(list, page))
+            paginator.counter = lambda queryset: counted
+            number = paginator.validate_number(number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=number, message=str(exc)))
+
+        self.page = Page(rows, number, paginator)
+        return rows
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        return Response(
+            {
+                "count": paginator.count,
+                "count_exact": paginator.count_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_exact"] = {"type": "boolean", "example": True}
+        return response_schema
+
+
+class ProductCursorPagination(BasePagination):
+    """
+    Keyset pagination over ``(created_at, id)`` or ``(price, id)``.
+
+    Each cursor carries the sort key of the row it was cut from, so pages stay
+    consistent when rows are inserted or soft deleted between fetches, and no
+    COUNT query is issued.
+    """
+
+    page_size = 10
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+    project = None
+
+    # ordering param -> (sort field, descending)
+    orderings = {
+        "-created_at": ("created_at", True),
+        "created_at": ("created_at", False),
+        "-price": ("price", True),
+        "price": ("price", False),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+
+        self.ordering = request.query_params.get(self.ordering_query_param)
+        if self.ordering not in self.orderings:
+            self.ordering = self.default_ordering
+        self.field, descending = self.orderings[self.ordering]
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor["reverse"]
+
+        # Walking backwards flips the sort; the page is flipped back below.
+        desc = descending != reverse
+        prefix = "-" if desc else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+
+        if cursor is not None:
+            lookup = "lt" if desc else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": cursor["value"]})
+                | Q(**{self.field: cursor["value"], f"id__{lookup}": cursor["id"]})
+            )
+
+        queryset = queryset[: self.page_size + 1]
+        if self.project is not None:
+            queryset = self.project(queryset)
+        rows = list(queryset)
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.cursor = cursor
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            return self.build_link(self.page[-1], reverse=False)
+        # Empty page reached backwards: resume forwards from the same boundary.
+        return self.build_link(None, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            return self.build_link(self.page[0], reverse=True)
+        return self.build_link(None, reverse=True)
+
+    def build_link(self, row, reverse):
+        if row is None:
+            value, pk = self.cursor["raw_value"], self.cursor["id"]
+        else:
+            value, pk = self._read(row, self.field), self._read(row, "id")
+            value = value.isoformat() if self.field == "created_at" else str(value)
+
+        payload = {"o": self.ordering, "v": value, "id": str(pk), "r": reverse}
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if payload["o"] != self.ordering:
+                raise ValueError
+            if self.field == "created_at":
+                value = parse_datetime(payload["v"])
+                if value is None:
+                    raise ValueError
+            else:
+                value = Decimal(payload["v"])
+                # NaN and Infinity parse, but no price filter can be built from them.
+                if not value.is_finite():
+                    raise ValueError
+            if not isinstance(payload["id"], str):
+                raise ValueError
+            return {
+                "value": value,
+                "raw_value": payload["v"],
+                "id": str(uuid.UUID(payload["id"])),
+                "reverse": bool(payload["r"]),
+            }
+        except (AttributeError, binascii.Error, InvalidOperation, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _read(row, field):
+        if isinstance(row, Mapping):
+            return row[field]
+        return getattr(row, field)
@@ -0,0 +1,56 @@
+import csv
+import io
+from itertools import batched
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON, one document per item.
+
+    ``stream`` encodes an iterable lazily in batches for StreamingHttpResponse;
+    ``render`` covers ordinary responses such as errors.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        return b"".join(self.stream(items))
+
+    def stream(self, items, fields=None, batch_size=1000):
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        default = self.encoder.default
+        for batch in batched(items, batch_size):
+            yield b"".join(orjson.dumps(item, default=default, option=option) for item in batch)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV with a header row; missing keys and None become empty cells."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        fields = list(items[0]) if items else []
+        return b"".join(self.stream(items, fields))
+
+    def stream(self, items, fields, batch_size=1000):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for batch in batched(items, batch_size):
+            writer.writerows(batch)
+            yield buffer.getvalue().encode(self.charset)
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
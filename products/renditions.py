@@ -0,0 +1,125 @@
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+# Configured name -> (Pillow format, file extension, Pillow feature to check).
+FORMATS = {
+    "jpeg": ("JPEG", "jpg", "jpg"),
+    "webp": ("WEBP", "webp", "webp"),
+    "avif": ("AVIF", "avif", "avif"),
+}
+
+# Keep at least this much resolution above the largest rendition before the
+# final resample, as Image.thumbnail's reducing_gap does.
+REDUCING_GAP = 2
+
+
+class ImageRejected(ValueError):
+    """The upload is not an image, or is over the pixel budget; retrying cannot help."""
+
+
+@dataclass(frozen=True)
+class Rendition:
+    format: str
+    size: int
+    width: int
+    height: int
+    # Positioned at 0, ready to be streamed to storage.
+    content: BytesIO
+
+    @property
+    def extension(self):
+        return FORMATS[self.format][1]
+
+
+def available_formats(names):
+    """The configured format names this Pillow build can encode, in order."""
+    available = []
+    for name in names:
+        if name not in FORMATS:
+            logger.warning("Unknown thumbnail format %r ignored", name)
+        elif not features.check(FORMATS[name][2]):
+            logger.warning("Pillow cannot encode %s, skipping those renditions", name)
+        else:
+            available.append(name)
+    return available
+
+
+def is_complete(renditions, sizes, formats):
+    return all(
+        set(sizes) <= {entry["size"] for entry in renditions.get(name, ())} for name in formats
+    )
+
+
+def _decode(source, box, max_pixels):
+    """
+    Open ``source`` and decode it once, at the smallest resolution that still
+    covers ``box`` with REDUCING_GAP to spare.
+
+    JPEGs are DCT-scaled while decoding (draft mode), so a 24MP photo is never
+    fully decoded for a 600px rendition; other formats are reduced by an
+    integer factor right after loading. Only the header has been read when the
+    pixel budget is checked, and it applies to what would actually be decoded.
+    """
+    target = (box * REDUCING_GAP, box * REDUCING_GAP)
+    try:
+        image = Image.open(source)
+    except (UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        raise ImageRejected(str(exc)) from exc
+
+    with image:
+        image.draft(None, target)
+        if max_pixels and image.width * image.height > max_pixels:
+            raise ImageRejected(
+                f"{image.width}x{image.height} image is over the {max_pixels} pixel budget"
+            )
+        image = ImageOps.exif_transpose(image)
+
+    factor = min(image.width // target[0], image.height // target[1])
+    if factor > 1:
+        image = image.reduce(factor)
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _encode(image, name, quality):
+    pil_format = FORMATS[name][0]
+    if pil_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format=pil_format, quality=quality)
+    buffer.seek(0)
+    return buffer
+
+
+def render(source, sizes, formats, quality, max_pixels=None):
+    """
+    Every ``size`` x ``format`` rendition of the image in the file-like ``source``.
+
+    Sizes are bounding boxes, as with Image.thumbnail; an image smaller than a
+    box is not upscaled. The source is decoded once for all renditions, and
+    ImageRejected is raised for anything that is not an image or would decode
+    to more than ``max_pixels``.
+    """
+    image = _decode(source, max(sizes), max_pixels)
+    renditions = []
+    for size in sorted(set(sizes)):
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        for name in formats:
+            content = _encode(resized, name, quality)
+            renditions.append(Rendition(name, size, resized.width, resized.height, content))
+    return renditions
+
+
+def srcset(renditions, url):
+    """``{format: "url 150w, url 300w"}`` for a product's ``renditions``."""
+    return {
+        name: ", ".join(f"{url(entry['name'])} {entry['width']}w" for entry in entries)
+        for name, entries in renditions.items()
+    }
@@ -0,0 +1,107 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, connections
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "products_product_fts"
+
+_token_re = re.compile(r"\w+")
+
+SQLITE_FTS_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        product_id UNINDEXED, name, description, tokenize = 'porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON products_product
+    BEGIN
+        INSERT INTO {FTS_TABLE} (product_id, name, description)
+        VALUES (NEW.id, NEW.name, coalesce(NEW.description, ''));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF name, description
+    ON products_product
+    BEGIN
+        UPDATE {FTS_TABLE}
+        SET name = NEW.name, description = coalesce(NEW.description, '')
+        WHERE product_id = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON products_product
+    BEGIN
+        DELETE FROM {FTS_TABLE} WHERE product_id = OLD.id;
+    END
+    """,
+    f"DELETE FROM {FTS_TABLE}",
+    f"""
+    INSERT INTO {FTS_TABLE} (product_id, name, description)
+    SELECT id, name, coalesce(description, '') FROM products_product
+    """,
+]
+
+
+def search_products(queryset, term):
+    """
+    Filter ``queryset`` to products matching ``term`` and rank them by relevance.
+
+    PostgreSQL matches against the trigger-maintained ``search_vector`` column
+    (GIN indexed); SQLite uses the FTS5 table created by the same migration.
+    Every token is prefix-matched and all tokens must match.
+    """
+    tokens = _token_re.findall(term)
+    if not tokens:
+        return queryset
+
+    if connection.vendor == "postgresql":
+        query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
+    else:
+        match = " ".join(f'"{token}"*' for token in tokens)
+        matching_ids = f"SELECT product_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        queryset = queryset.filter(id__in=RawSQL(matching_ids, (match,))).annotate(
+            # bm25() is lower-is-better; negate it so both backends sort descending.
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, 0.0, 10.0, 1.0) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND product_id = products_product.id",
+                (match,),
+            )
+        )
+
+    return queryset.order_by("-search_rank", "-created_at")
+
+
+def install_sqlite_fts(sender, using, **kwargs):
+    """
+    post_migrate hook installing the SQLite FTS5 fallback and resyncing it.
+
+    SQLite rebuilds a table for most ALTERs and drops its triggers on the way,
+    so this runs after every migrate rather than once in a migration.
+    """
+    if connections[using].vendor != "sqlite":
+        return
+    with connections[using].cursor() as cursor:
+        for statement in SQLITE_FTS_SQL:
+            cursor.execute(statement)
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """``?search=`` backed by the full-text index instead of ``icontains``."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_products(queryset, " ".join(terms))
@@ -1,5 +1,90 @@
+import json
+
+from django.db import connections
+from django.db.models import Q
+
 from .models import Product
 
 
 def get_products_queryset():
-    return Product.objects.select_related("category").order_by("-created_at")
+    return Product.objects.select_related("category").defer("search_vector").order_by("-created_at")
+
+
+def get_products_missing_thumbnails():
+    """Products with an image but no thumbnail, or only the pre-rendition one."""
+    return (
+        Product.objects.exclude(Q(image="") | Q(image__isnull=True))
+        .filter(Q(thumbnail="") | Q(thumbnail__isnull=True) | Q(renditions={}))
+        .order_by("pk")
+    )
+
+
+# Serializer fields whose model columns differ from their name.
+FIELD_COLUMNS = {
+    # deleted_at masks a category whose deletion is in progress.
+    "category": ("category", "category__slug", "category__deleted_at"),
+    "category_name": ("category", "category__name", "category__deleted_at"),
+    "srcset": ("renditions",),
+}
+
+# Always loaded: cursor pagination and conditional-GET validators read these.
+KEY_COLUMNS = ("created_at", "updated_at", "price")
+
+
+def project_products(queryset, fields):
+    """Restrict ``queryset`` to the columns behind serializer ``fields`` (None = all)."""
+    if fields is None:
+        return queryset
+
+    columns = set(KEY_COLUMNS)
+    for name in fields:
+        columns.update(FIELD_COLUMNS.get(name, (name,)))
+
+    # select_related() cannot traverse a relation whose columns are deferred.
+    queryset = queryset.select_related(None)
+    if "category" in columns:
+        queryset = queryset.select_related("category")
+    return queryset.only(*columns)
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL's estimate of how many rows ``queryset`` matches, or None.
+
+    Unfiltered querysets read the table's ``reltuples``; filtered ones take the
+    planner's row estimate from EXPLAIN. Other backends have no cheap estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    queryset = queryset.order_by().values("pk")
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed.
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_products(queryset, estimate_above):
+    """
+    ``(count, exact)`` for ``queryset``.
+
+    Runs COUNT(*) unless the planner expects more than ``estimate_above`` rows,
+    in which case the estimate is returned instead.
+    """
+    estimate = estimate_count(queryset)
+    if estimate is not None and estimate > estimate_above:
+        return estimate, False
+    return queryset.count(), True
@@ -1,16 +1,61 @@
+import re
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
 from rest_framework import serializers
 
 from categories.models import Category
 
+from . import renditions
 from .models import Product
+from .selectors import KEY_COLUMNS, get_products_queryset
 from .services import create_product, update_product
 
+_CENTS = Decimal("0.01")
+_SKIP = object()
+# Names storage.url() would return as base_url + name: nothing to quote or normalise.
+_PLAIN_NAME = re.compile(r"[\w-]+(?:[./][\w-]+)*", re.ASCII)
+
+
+def get_requested_fields(query_params):
+    """
+    Serializer fields selected by ``?fields=`` and ``?exclude=``.
+
+    Returns None when neither is given; unknown names, or a selection that
+    leaves nothing, raise ValidationError.
+    """
+    available = ProductSerializer.Meta.fields
+    include = {name for name in query_params.get("fields", "").split(",") if name}
+    exclude = {name for name in query_params.get("exclude", "").split(",") if name}
+
+    unknown = (include | exclude) - set(available)
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": [f"Unknown field(s): {', '.join(sorted(unknown))}."]}
+        )
+
+    if not include and not exclude:
+        return None
+    selected = [
+        name for name in available if (not include or name in include) and name not in exclude
+    ]
+    if not selected:
+        raise serializers.ValidationError({"fields": ["The selection leaves no fields."]})
+    return selected
+
+
+def _category_deleted(product):
+    return product.category_id is not None and product.category.deleted_at is not None
+
 
 class ProductSerializer(serializers.ModelSerializer):
 
     category = serializers.SlugRelatedField(
         slug_field="slug",
-        queryset=Category.objects.all(),
+        queryset=Category.objects.live(),
         required=False,
         allow_null=True,
     )
@@ -19,6 +64,8 @@ class ProductSerializer(serializers.ModelSerializer):
 
     slug = serializers.CharField(required=False, allow_blank=True)
 
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Product
         fields = [
@@ -32,6 +79,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "category_name",
             "image",
             "thumbnail",
+            "srcset",
             "is_active",
             "created_at",
             "updated_at",
@@ -44,6 +92,25 @@ class ProductSerializer(serializers.ModelSerializer):
             "is_active",
         ]
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_srcset(self, obj) -> dict[str, str]:
+        return renditions.srcset(obj.renditions, obj.thumbnail.storage.url)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # A category being deleted reads as none while its products are detached.
+        if {"category", "category_name"} & data.keys() and _category_deleted(instance):
+            if "category" in data:
+                data["category"] = None
+            data.pop("category_name", None)
+        return data
+
     def create(self, validated_data):
         return create_product(**validated_data)
 
@@ -54,7 +121,7 @@ class ProductSerializer(serializers.ModelSerializer):
 class ProductWriteSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field="slug",
-        queryset=Category.objects.all(),
+        queryset=Category.objects.live(),
         required=False,
         allow_null=True,
     )
@@ -79,3 +146,267 @@ class ProductWriteSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         return update_product(instance, **validated_data)
+
+
+class CategorySlugField(serializers.SlugRelatedField):
+    """``SlugRelatedField`` that resolves from ``context["categories"]`` when preloaded."""
+
+    def to_internal_value(self, data):
+        categories = self.context.get("categories")
+        if categories is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail("invalid")
+        try:
+            return categories[data]
+        except KeyError:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=data)
+
+
+class ProductBulkListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch with one query each for categories, slugs and, for
+    updates, the target products (exposed as ``instances``, keyed by pk).
+
+    Errors come back as a list aligned with the input, like ListSerializer's,
+    with batch-level problems merged into each item's errors.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        items = [item if isinstance(item, dict) else {} for item in data]
+        slugs = {item.get("category") for item in items if isinstance(item.get("category"), str)}
+        self.context["categories"] = Category.objects.live().in_bulk(slugs, field_name="slug")
+        batch_errors = self.get_batch_errors(items)
+
+        try:
+            validated = super().to_internal_value(data)
+        except serializers.ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            for errors, extra in zip(exc.detail, batch_errors):
+                errors.update(extra)
+            raise
+
+        if any(batch_errors):
+            raise serializers.ValidationError(batch_errors)
+        return validated
+
+    def get_batch_errors(self, items):
+        errors = [{} for _ in items]
+        update = "id" in self.child.fields
+
+        # Item-level validation would silently drop these, e.g. an "id" on create.
+        known = set(self.child.fields)
+        for index, item in enumerate(items):
+            for key in sorted(item.keys() - known):
+                errors[index][key] = ["Unknown field."]
+
+        pks = {}
+        self.instances = {}
+        if update:
+            for index, item in enumerate(items):
+                try:
+                    pks[index] = uuid.UUID(str(item["id"]))
+                except (KeyError, ValueError):
+                    pass
+            self.instances = (
+                get_products_queryset().filter(is_active=True).in_bulk(set(pks.values()))
+            )
+            seen = set()
+            for index, item in enumerate(items):
+                if "id" not in item:
+                    errors[index]["id"] = ["This field is required."]
+                elif index not in pks:
+                    continue
+                elif pks[index] not in self.instances:
+                    errors[index]["id"] = ["Product not found."]
+                elif pks[index] in seen:
+                    errors[index]["id"] = ["Duplicate id in batch."]
+                seen.add(pks.get(index))
+
+        slugs = [
+            item["slug"].strip() if isinstance(item.get("slug"), str) else "" for item in items
+        ]
+        owners = dict(
+            Product.objects.filter(slug__in=[slug for slug in slugs if slug]).values_list(
+                "slug", "pk"
+            )
+        )
+        # Products the batch moves off their current slug: given another one, or
+        # renamed without one (bulk_update_products then allocates a fresh slug).
+        freed = set()
+        for index, item in enumerate(items):
+            instance = self.instances.get(pks.get(index))
+            if instance is None:
+                continue
+            if slugs[index]:
+                moved = slugs[index] != instance.slug
+            else:
+                name = item.get("name")
+                moved = isinstance(name, str) and name.strip() != instance.name
+            if moved:
+                freed.add(instance.pk)
+
+        claimed = set()
+        for index, slug in enumerate(slugs):
+            if not slug:
+                continue
+            owner = owners.get(slug)
+            if slug in claimed or (
+                owner is not None and owner != pks.get(index) and owner not in freed
+            ):
+                errors[index]["slug"] = ["product with this slug already exists."]
+            claimed.add(slug)
+
+        return errors
+
+
+class ProductBulkCreateSerializer(ProductWriteSerializer):
+    category = CategorySlugField(
+        slug_field="slug",
+        queryset=Category.objects.live(),
+        required=False,
+        allow_null=True,
+    )
+
+    class Meta(ProductWriteSerializer.Meta):
+        list_serializer_class = ProductBulkListSerializer
+        ref_name = "ProductBulkCreate"
+
+
+class ProductBulkUpdateSerializer(ProductBulkCreateSerializer):
+    id = serializers.UUIDField()
+
+    class Meta(ProductBulkCreateSerializer.Meta):
+        fields = ["id", *ProductBulkCreateSerializer.Meta.fields]
+        ref_name = "ProductBulkUpdate"
+
+
+# Plan getters take ``(row, tz)``; the current timezone is resolved once per batch.
+
+
+def _column(column, convert=None):
+    if convert is None:
+        return lambda row, tz: row[column]
+    return lambda row, tz: None if row[column] is None else convert(row[column])
+
+
+def _datetime_column(column):
+    # Mirrors DRF's DateTimeField with USE_TZ and the default ISO 8601 format.
+    def iso(row, tz):
+        value = row[column]
+        if value is None:
+            return None
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return iso
+
+
+def _storage_url(storage):
+    plain_joins = isinstance(storage, FileSystemStorage)
+
+    def url(name):
+        # urljoin() dominates storage.url(); skip it when it cannot change anything.
+        if plain_joins and _PLAIN_NAME.fullmatch(name):
+            base_url = storage.base_url
+            if base_url.endswith("/") and "/." not in base_url:
+                return base_url + name
+        return storage.url(name)
+
+    return url
+
+
+def _file_url(field_name):
+    url = _storage_url(Product._meta.get_field(field_name).storage)
+    return lambda row, tz: url(row[field_name]) if row[field_name] else None
+
+
+def _srcset():
+    url = _storage_url(Product._meta.get_field("thumbnail").storage)
+    return lambda row, tz: renditions.srcset(row["renditions"], url)
+
+
+class ProductRowSerializer:
+    """
+    Read-only fast path producing exactly what ``ProductSerializer`` would.
+
+    Works on ``values()`` dicts instead of model instances, with the per-field
+    work compiled once per fieldset, so listings skip model hydration and DRF
+    field machinery. Parity is enforced by test_row_serializer.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.plan = [(name, self._compile(name)) for name in self.fields]
+
+        columns = {"id", *KEY_COLUMNS}
+        for name in self.fields:
+            columns.update(self.field_columns.get(name, (name,)))
+        self.columns = sorted(columns)
+
+    field_columns = {
+        "category": ("category__slug", "category__deleted_at"),
+        # category_name is omitted entirely when there is no category, as DRF
+        # skips a dotted source that hits None.
+        "category_name": ("category", "category__name", "category__deleted_at"),
+        "srcset": ("renditions",),
+    }
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _for_fields(cls, fields):
+        return cls(fields)
+
+    @classmethod
+    def for_fields(cls, fields=None):
+        # Keep declaration order, as ProductSerializer does whatever order was asked for.
+        available = ProductSerializer.Meta.fields
+        return cls._for_fields(
+            tuple(name for name in available if fields is None or name in fields)
+        )
+
+    @staticmethod
+    def _compile(name):
+        if name == "id":
+            return _column("id", str)
+        if name == "price":
+            return _column("price", lambda value: f"{value.quantize(_CENTS):f}")
+        if name == "category":
+            return lambda row, tz: None if row["category__deleted_at"] else row["category__slug"]
+        if name == "category_name":
+            return lambda row, tz: (
+                _SKIP
+                if row["category"] is None or row["category__deleted_at"]
+                else row["category__name"]
+            )
+        if name in ("image", "thumbnail"):
+            return _file_url(name)
+        if name == "srcset":
+            return _srcset()
+        if name in ("created_at", "updated_at"):
+            return _datetime_column(name)
+        return _column(name)
+
+    def project(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row, tz=None):
+        if tz is None:
+            tz = timezone.get_current_timezone()
+        data = {}
+        for name, getter in self.plan:
+            value = getter(row, tz)
+            if value is not _SKIP:
+                data[name] = value
+        return data
+
+    def serialize(self, rows):
+        tz = timezone.get_current_timezone()
+        to_representation = self.to_representation
+        return [to_representation(row, tz) for row in rows]
@@ -1,16 +1,83 @@
+from collections import Counter
+
+from celery import group
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from categories.services import adjust_product_counts
+from core.cache import invalidate
+from core.slugs import SAVE_ATTEMPTS, save_with_unique_slug
+
 from .models import Product
 from .tasks import generate_thumbnail
-from .utils import generate_unique_slug
+from .utils import generate_unique_slugs
+
+CACHE_NAMESPACE = "products"
+
+
+class BulkWriteConflict(Exception):
+    """A bulk write hit a uniqueness conflict; ``indexes`` are the items whose slug was taken."""
+
+    def __init__(self, indexes):
+        super().__init__(f"Conflicting items: {indexes}")
+        self.indexes = indexes
+
+
+def _conflicting_items(slugs, exclude=()):
+    """Positions in ``slugs`` held by products outside ``exclude``, e.g. a concurrent writer's."""
+    taken = set(
+        Product.objects.filter(slug__in=slugs)
+        .exclude(pk__in=exclude)
+        .values_list("slug", flat=True)
+    )
+    return [index for index, slug in enumerate(slugs) if slug in taken]
+
+
+def _count_state(product):
+    # What Category.active_product_count depends on.
+    return product.category_id, product.is_active
+
+
+def _lock_count_states(pks):
+    """
+    ``{pk: count state}`` as stored, with the rows locked until the transaction
+    ends. Deltas must start from these rather than from in-memory instances,
+    which concurrent writers may have made stale.
+    """
+    rows = (
+        Product.objects.filter(pk__in=pks)
+        .order_by("pk")
+        .select_for_update()
+        .values_list("pk", "category_id", "is_active")
+    )
+    return {pk: (category_id, is_active) for pk, category_id, is_active in rows}
+
+
+def _count_deltas(changes):
+    """``{category_id: delta}`` from ``(before, after)`` count states (``before`` None if new)."""
+    deltas = Counter()
+    for before, after in changes:
+        if before == after:
+            continue
+        if before is not None and before[1]:
+            deltas[before[0]] -= 1
+        if after[1]:
+            deltas[after[0]] += 1
+    return deltas
 
 
 def create_product(**validated_data):
     slug = validated_data.get("slug")
 
-    # Handle None OR empty string properly
-    if not slug or slug.strip() == "":
-        validated_data["slug"] = generate_unique_slug(validated_data["name"])
-
-    product = Product.objects.create(**validated_data)
+    with transaction.atomic():
+        # Handle None OR empty string properly
+        if not slug or slug.strip() == "":
+            product = Product(**validated_data)
+            save_with_unique_slug(product, product.name, product.save)
+        else:
+            product = Product.objects.create(**validated_data)
+        adjust_product_counts(_count_deltas([(None, _count_state(product))]))
+    invalidate(CACHE_NAMESPACE)
 
     # Dispatch async thumbnail
     if product.image:
@@ -26,12 +93,135 @@ def update_product(instance: Product, **validated_data):
     if "name" in validated_data and validated_data["name"] != instance.name:
         name_changed = True
 
-    # If slug not provided OR blank and name changed → regenerate
-    if (not slug or slug.strip() == "") and name_changed:
-        validated_data["slug"] = generate_unique_slug(validated_data["name"], instance=instance)
-
     for attr, value in validated_data.items():
         setattr(instance, attr, value)
 
-    instance.save()
+    with transaction.atomic():
+        before = _lock_count_states([instance.pk])[instance.pk]
+        # If slug not provided OR blank and name changed → regenerate
+        if (not slug or slug.strip() == "") and name_changed:
+            save_with_unique_slug(instance, instance.name, instance.save)
+        else:
+            instance.save()
+        adjust_product_counts(_count_deltas([(before, _count_state(instance))]))
+    invalidate(CACHE_NAMESPACE)
+    return instance
+
+
+def _dispatch_thumbnails(products):
+    # One grouped job instead of a broker round trip per product.
+    signatures = [generate_thumbnail.s(str(product.id)) for product in products if product.image]
+    if signatures:
+        transaction.on_commit(lambda: group(signatures).delay())
+
+
+def bulk_create_products(items, batch_size=500):
+    """
+    Create products from validated ``items`` in one transaction.
+
+    Missing slugs are allocated together, rows are written with bulk_create
+    and thumbnails for every product with an image go out as one group. If a
+    concurrent writer takes one of the allocated slugs, the batch is retried
+    with fresh ones.
+    """
+    pending = [index for index, item in enumerate(items) if not (item.get("slug") or "").strip()]
+    explicit = {item["slug"] for index, item in enumerate(items) if index not in pending}
+
+    for attempt in range(1, SAVE_ATTEMPTS + 1):
+        slugs = generate_unique_slugs(
+            (items[index]["name"] for index in pending), reserved=explicit
+        )
+        for index, slug in zip(pending, slugs):
+            items[index]["slug"] = slug
+
+        products = [Product(**item) for item in items]
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(products, batch_size=batch_size)
+                adjust_product_counts(
+                    _count_deltas((None, _count_state(product)) for product in products)
+                )
+                invalidate(CACHE_NAMESPACE)
+                _dispatch_thumbnails(products)
+        except IntegrityError as exc:
+            if attempt == SAVE_ATTEMPTS or not pending:
+                raise BulkWriteConflict(
+                    _conflicting_items([item["slug"] for item in items])
+                ) from exc
+        else:
+            return products
+
+
+def bulk_update_products(changes, batch_size=500):
+    """
+    Apply ``(instance, validated_data)`` pairs in one transaction.
+
+    Mirrors update_product: a renamed product without an explicit slug gets a
+    fresh one. Only the fields that changed somewhere in the batch are written.
+    """
+    renamed = [
+        (instance, data)
+        for instance, data in changes
+        if not (data.get("slug") or "").strip() and data.get("name", instance.name) != instance.name
+    ]
+    slugs = generate_unique_slugs(
+        (data["name"] for _, data in renamed),
+        exclude=[instance.pk for instance, _ in renamed],
+        reserved={data["slug"] for _, data in changes if (data.get("slug") or "").strip()},
+    )
+    for (_, data), slug in zip(renamed, slugs):
+        data["slug"] = slug
+
+    # bulk_update() skips auto_now, so updated_at is set here.
+    now = timezone.now()
+    fields = {"updated_at"}
+    for instance, data in changes:
+        for attr, value in data.items():
+            setattr(instance, attr, value)
+        instance.updated_at = now
+        fields.update(data)
+
+    instances = [instance for instance, _ in changes]
+    try:
+        with transaction.atomic():
+            before = _lock_count_states([instance.pk for instance in instances])
+            Product.objects.bulk_update(instances, sorted(fields), batch_size=batch_size)
+            # Columns outside ``fields`` keep their stored values.
+            after = {
+                instance.pk: (
+                    instance.category_id if "category" in fields else before[instance.pk][0],
+                    instance.is_active if "is_active" in fields else before[instance.pk][1],
+                )
+                for instance in instances
+            }
+            adjust_product_counts(_count_deltas((before[pk], after[pk]) for pk in after))
+            invalidate(CACHE_NAMESPACE)
+    except IntegrityError as exc:
+        raise BulkWriteConflict(
+            _conflicting_items(
+                [instance.slug for instance in instances],
+                exclude=[instance.pk for instance in instances],
+            )
+        ) from exc
+
+    return instances
+
+
+def save_renditions(instance: Product, thumbnail, renditions):
+    instance.thumbnail = thumbnail
+    instance.renditions = renditions
+    instance.save(update_fields=["thumbnail", "renditions", "updated_at"])
+    invalidate(CACHE_NAMESPACE)
+    return instance
+
+
+def soft_delete_product(instance: Product):
+    instance.is_active = False
+    with transaction.atomic():
+        before = _lock_count_states([instance.pk])[instance.pk]
+        # updated_at moves too, so list validators (max updated_at) see the change.
+        instance.save(update_fields=["is_active", "updated_at"])
+        # Only is_active is written; the stored category stays.
+        adjust_product_counts(_count_deltas([(before, (before[0], False))]))
+    invalidate(CACHE_NAMESPACE)
     return instance
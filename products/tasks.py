@@ -1,11 +1,10 @@
 import os
-from io import BytesIO
 
 from celery import shared_task
 from django.conf import settings
-from django.core.files.base import ContentFile
-from PIL import Image
+from django.core.files.base import File
 
+from . import renditions
 from .models import Product
 
 
@@ -16,31 +15,56 @@ from .models import Product
     retry_kwargs={"max_retries": 5},
 )
 def generate_thumbnail(self, product_id):
+    # services dispatches this task, so it is imported here.
+    from .services import save_renditions
+
     product = Product.objects.get(id=product_id)
+    sizes = settings.THUMBNAIL_SIZES
+    formats = renditions.available_formats(settings.THUMBNAIL_FORMATS)
 
     # Idempotency check
-    if product.thumbnail:
+    if product.thumbnail and renditions.is_complete(product.renditions, sizes, formats):
         return "Thumbnail already exists"
 
     if not product.image:
         return "No image to process"
 
-    image = Image.open(product.image.path)
-
-    size = settings.THUMBNAIL_SIZE
-    quality = settings.THUMBNAIL_QUALITY
-
-    image.thumbnail((size, size))
-
-    thumb_io = BytesIO()
-    image.save(thumb_io, format="JPEG", quality=quality)
-
-    thumb_name = f"thumb_{os.path.basename(product.image.name)}"
+    # Read through the storage API, so any backend works; only the header is
+    # read before the budgets are checked.
+    if product.image.size > settings.THUMBNAIL_MAX_BYTES:
+        return f"Image rejected: {product.image.size} bytes is over the byte budget"
+    try:
+        with product.image.open("rb") as source:
+            rendered = renditions.render(
+                source,
+                sizes,
+                formats,
+                settings.THUMBNAIL_QUALITY,
+                max_pixels=settings.THUMBNAIL_MAX_PIXELS,
+            )
+    except renditions.ImageRejected as exc:
+        return f"Image rejected: {exc}"
 
-    product.thumbnail.save(
-        thumb_name,
-        ContentFile(thumb_io.getvalue()),
-        save=True,
-    )
+    storage = product.thumbnail.storage
+    stem = os.path.splitext(os.path.basename(product.image.name))[0]
+    recorded = {}
+    thumbnail = None
+    for rendition in rendered:
+        name = storage.save(
+            f"thumbnails/{stem}_{rendition.size}.{rendition.extension}",
+            File(rendition.content),
+        )
+        recorded.setdefault(rendition.format, []).append(
+            {
+                "name": name,
+                "size": rendition.size,
+                "width": rendition.width,
+                "height": rendition.height,
+            }
+        )
+        # ``thumbnail`` keeps the single legacy rendition: THUMBNAIL_SIZE, first format.
+        if thumbnail is None and rendition.size == settings.THUMBNAIL_SIZE:
+            thumbnail = name
 
+    save_renditions(product, thumbnail, recorded)
     return "Thumbnail generated"
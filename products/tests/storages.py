@@ -0,0 +1,74 @@
+import io
+from collections import Counter
+
+from django.core.files.base import File
+from django.core.files.storage import Storage
+
+
+class _Stream(io.RawIOBase):
+    def __init__(self, storage, name):
+        self.storage, self.name = storage, name
+        self.view = memoryview(storage.objects[name])
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.view[self.position : self.position + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self.position += len(chunk)
+        self.storage.bytes_read[self.name] += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: len(self.view)}[whence]
+        self.position = base + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class ObjectStorage(Storage):
+    """
+    In-memory object store for tests: no local paths, reads stream straight
+    from the stored blob and record how much was read, and writes record the
+    largest chunk they were handed.
+    """
+
+    objects = {}
+    bytes_read = Counter()
+    largest_write_chunk = Counter()
+
+    @classmethod
+    def reset(cls):
+        cls.objects.clear()
+        cls.bytes_read.clear()
+        cls.largest_write_chunk.clear()
+
+    def _open(self, name, mode="rb"):
+        return File(_Stream(self, name), name)
+
+    def _save(self, name, content):
+        parts = []
+        for chunk in content.chunks():
+            self.largest_write_chunk[name] = max(self.largest_write_chunk[name], len(chunk))
+            parts.append(chunk)
+        self.objects[name] = b"".join(parts)
+        return name
+
+    def exists(self, name):
+        return name in self.objects
+
+    def size(self, name):
+        return len(self.objects[name])
+
+    def delete(self, name):
+        self.objects.pop(name, None)
+
+    def url(self, name):
+        return f"https://objects.example/{name}"
@@ -0,0 +1,66 @@
+import pytest
+from django.test import Client
+
+from categories.services import create_category
+from products.services import create_product
+
+# Async views fetch through worker threads with their own connections, which
+# only see committed rows.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def catalogue():
+    audio = create_category(name="Audio")
+    for i in range(12):
+        create_product(name=f"Speaker {i}", price=i, stock=1, category=audio if i % 2 else None)
+
+
+def test_async_list_matches_sync_list(catalogue):
+    client = Client()
+
+    for query in ("", "?min_price=3&ordering=-price", "?page=2&fields=name,price"):
+        sync = client.get(f"/api/products/{query}").json()
+        response = client.get(f"/api/async/products/{query}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] == sync["results"]
+        assert (data["count"], data["count_exact"]) == (sync["count"], sync["count_exact"])
+
+    first = client.get("/api/async/products/").json()
+    assert first["next"] == "http://testserver/api/async/products/?page=2"
+
+
+def test_async_list_cursor_pages_and_errors(catalogue):
+    client = Client()
+
+    page = client.get("/api/async/products/?pagination=cursor&ordering=price").json()
+    assert [item["price"] for item in page["results"]["data"]][:2] == ["0.00", "1.00"]
+    assert client.get(page["next"]).status_code == 200
+
+    assert client.get("/api/async/products/?page=9").json() == {"detail": "Invalid page."}
+    assert client.get("/api/async/products/?fields=secret").status_code == 400
+
+
+def test_async_detail_revalidates_and_404s(catalogue):
+    client = Client()
+
+    response = client.get("/api/async/products/speaker-3/")
+    assert response.json()["data"]["category_name"] == "Audio"
+    assert response.json() == client.get("/api/products/speaker-3/").json()
+
+    revalidated = client.get("/api/async/products/speaker-3/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == 304
+
+    missing = client.get("/api/async/products/nope/")
+    assert missing.status_code == 404
+    assert missing.json() == {"detail": "No Product matches the given query."}
+
+
+def test_async_category_views(catalogue):
+    client = Client()
+
+    assert client.get("/api/async/categories/").json()["results"]["data"][0]["slug"] == "audio"
+    assert client.get("/api/async/categories/audio/").json()["data"]["name"] == "Audio"
+    assert client.get("/api/async/categories/video/").status_code == 404
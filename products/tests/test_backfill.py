@@ -0,0 +1,64 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from config.celery import app
+from products.models import Product
+from products.services import create_product, update_product
+
+
+@pytest.fixture
+def legacy(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.THUMBNAIL_SIZES = [150, 300]
+    settings.THUMBNAIL_FORMATS = ["jpeg"]
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600)).save(buffer, format="JPEG")
+
+    products = []
+    for i in range(5):
+        product = create_product(name=f"Legacy {i}", price=1, stock=1)
+        image = SimpleUploadedFile(f"legacy-{i}.jpg", buffer.getvalue())
+        products.append(update_product(product, image=image))
+    create_product(name="No image", price=1, stock=1)
+    return products
+
+
+def _backfill(tmp_path, *args):
+    call_command(
+        "backfill_thumbnails", "--batch-size=2", f"--checkpoint={tmp_path / 'ckpt'}", *args
+    )
+
+
+@pytest.mark.django_db
+def test_local_backfill_renders_pending_products(legacy, tmp_path):
+    _backfill(tmp_path, "--local", "--workers=1")
+
+    rendered = Product.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True)
+    assert rendered.count() == 5
+    assert all(product.renditions["jpeg"] for product in rendered)
+    assert (tmp_path / "ckpt").read_text() == str(max(product.pk for product in legacy))
+
+
+@pytest.mark.django_db
+def test_backfill_resumes_after_checkpoint(legacy, tmp_path, capsys):
+    done = sorted(product.pk for product in legacy)[:3]
+    (tmp_path / "ckpt").write_text(str(done[-1]))
+
+    _backfill(tmp_path, "--local", "--workers=1")
+
+    assert "2 products pending" in capsys.readouterr().out
+    rendered = Product.objects.exclude(renditions={}).values_list("pk", flat=True)
+    assert set(rendered) == {product.pk for product in legacy} - set(done)
+
+
+@pytest.mark.django_db
+def test_celery_backfill_dispatches_chunks(legacy, tmp_path, monkeypatch):
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+
+    _backfill(tmp_path, "--chunk-size=2")
+
+    assert not Product.objects.filter(image__startswith="products/", renditions={}).exists()
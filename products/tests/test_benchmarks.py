@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from categories.models import Category
+from products.benchmarks import CatalogError, compare, run_suite, scenarios, seed_catalog
+from products.models import Product
+
+
+@pytest.mark.django_db
+def test_seeded_catalog_is_reproducible():
+    seed_catalog(300, categories=4, seed=7, batch_size=128)
+    first = list(Product.objects.order_by("id").values_list("id", "slug", "price", "category"))
+
+    with pytest.raises(CatalogError):
+        seed_catalog(300, categories=4, seed=7)
+    seed_catalog(300, categories=4, seed=7, flush=True)
+
+    assert list(Product.objects.order_by("id").values_list("id", "slug", "price", "category")) == (
+        first
+    )
+    assert Category.objects.count() == 4
+    # Repeated names get the numbered slugs save_with_unique_slug would give them.
+    assert Product.objects.filter(slug__regex=r"-\d+$").exists()
+
+
+@pytest.mark.django_db
+def test_suite_times_every_scenario_and_keeps_the_catalog(settings, tmp_path):
+    settings.THUMBNAIL_SIZES = [150]
+    settings.THUMBNAIL_FORMATS = ["jpeg"]
+    seed_catalog(50, categories=3)
+
+    results = run_suite(runs=2, warmup=1)
+
+    assert list(results) == [scenario.name for scenario in scenarios()]
+    assert all(summary["runs"] == 2 for summary in results.values())
+    assert results["list_cached"]["queries"] == 0
+    assert results["list"]["queries"] > 0
+    # Writes are rolled back.
+    assert Product.objects.count() == 50
+
+
+def test_compare_flags_slower_percentiles_and_extra_queries():
+    baseline = {"10000": {"detail": {"p50_ms": 4.0, "p90_ms": 5.0, "queries": 2}}}
+    noise = {"10000": {"detail": {"p50_ms": 4.3, "p90_ms": 5.4, "queries": 2}}}
+    slower = {"10000": {"detail": {"p50_ms": 6.0, "p90_ms": 5.0, "queries": 3}}}
+
+    assert compare(noise, baseline, threshold=0.2) == []
+    assert compare(slower, baseline, threshold=0.2) == [
+        "10000 products, detail: p50_ms 4.0 -> 6.0 (+50%)",
+        "10000 products, detail: queries 2 -> 3",
+    ]
+
+
+@pytest.mark.django_db
+def test_command_fails_on_regression_against_baseline(tmp_path):
+    seed_catalog(20, categories=2)
+    output = tmp_path / "results.json"
+    call_command("bench_api", "--scenario", "detail", "--runs", "2", "--output", str(output))
+    report = json.loads(output.read_text())
+    assert report["results"]["current"]["detail"]["queries"] > 0
+
+    report["results"]["current"]["detail"]["queries"] = 0
+    output.write_text(json.dumps(report))
+    with pytest.raises(CommandError, match="queries 0 -> "):
+        call_command("bench_api", "--scenario", "detail", "--runs", "2", "--baseline", str(output))
@@ -0,0 +1,149 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from categories.services import create_category
+from products.models import Product
+from products.serializers import ProductBulkUpdateSerializer
+from products.services import BulkWriteConflict, bulk_update_products, create_product
+
+
+@pytest.mark.django_db
+def test_bulk_create_validates_and_writes_in_constant_queries():
+    create_category(name="Audio")
+    create_category(name="Video")
+    create_product(name="Speaker", price=10, stock=1)
+    items = [
+        {"name": "Speaker", "price": f"{i}.50", "stock": i, "category": ("audio", "video")[i % 2]}
+        for i in range(50)
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = APIClient().post("/api/products/-/bulk/", items, format="json")
+
+    assert response.status_code == 201
+    data = response.data["data"]
+    assert [item["category_name"] for item in data[:2]] == ["Audio", "Video"]
+    slugs = {item["slug"] for item in data}
+    assert len(slugs) == 50 and "speaker" not in slugs
+    assert Product.objects.count() == 51
+    assert len(ctx.captured_queries) <= 8
+
+
+@pytest.mark.django_db
+def test_bulk_create_is_all_or_nothing_with_errors_by_index():
+    create_product(name="Taken", slug="taken", price=1, stock=1)
+    items = [
+        {"name": "Fine", "price": "1.00", "stock": 1},
+        {"name": "Bad category", "price": "1.00", "stock": 1, "category": "missing"},
+        {"name": "Clash", "slug": "taken", "price": "1.00", "stock": 1},
+        {"name": "Negative", "price": "-1", "stock": 1},
+    ]
+
+    response = APIClient().post("/api/products/-/bulk/", items, format="json")
+
+    assert response.status_code == 400
+    assert response.data["data"] is None
+    assert set(response.data["errors"]) == {"1", "2", "3"}
+    assert "category" in response.data["errors"]["1"]
+    assert response.data["errors"]["2"] == {"slug": ["product with this slug already exists."]}
+    assert Product.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_generated_slugs_avoid_explicit_slugs_in_the_same_batch():
+    items = [
+        {"name": "Fine", "price": "1.00", "stock": 1},
+        {"name": "Other", "slug": "fine", "price": "1.00", "stock": 1},
+    ]
+
+    response = APIClient().post("/api/products/-/bulk/", items, format="json")
+
+    assert response.status_code == 201
+    assert [item["slug"] for item in response.data["data"]] == ["fine-2", "fine"]
+
+
+@pytest.mark.django_db
+def test_bulk_update_patches_by_id_and_regenerates_renamed_slugs():
+    lamp = create_product(name="Lamp", price=10, stock=1)
+    desk = create_product(name="Desk", price=90, stock=2)
+    client = APIClient()
+
+    response = client.patch(
+        "/api/products/-/bulk/",
+        [{"id": str(lamp.id), "stock": 7}, {"id": str(desk.id), "name": "Standing Desk"}],
+        format="json",
+    )
+
+    assert response.status_code == 200
+    lamp.refresh_from_db()
+    desk.refresh_from_db()
+    assert (lamp.stock, lamp.slug) == (7, "lamp")
+    assert (desk.name, desk.slug) == ("Standing Desk", "standing-desk")
+    assert desk.updated_at > desk.created_at
+
+    missing = client.patch(
+        "/api/products/-/bulk/", [{"stock": 1}, {"id": str(lamp.id)}], format="json"
+    )
+    assert missing.data["errors"] == {"0": {"id": ["This field is required."]}}
+
+
+@pytest.mark.django_db
+def test_products_named_like_collection_actions_keep_their_detail_urls():
+    client = APIClient()
+    for name in ("Bulk", "Export"):
+        create_product(name=name, price=1, stock=1)
+
+    for slug in ("bulk", "export"):
+        assert client.get(f"/api/products/{slug}/").data["data"]["slug"] == slug
+        assert client.delete(f"/api/products/{slug}/").status_code == 204
+
+
+@pytest.mark.django_db
+def test_bulk_slug_conflicts_are_rejected_before_writing():
+    lamp = create_product(name="Lamp", price=1, stock=1)
+    desk = create_product(name="Desk", price=1, stock=1)
+    client = APIClient()
+
+    # Unknown keys are errors, not silently dropped.
+    response = client.post(
+        "/api/products/-/bulk/",
+        [{"id": str(lamp.id), "name": "Lamp", "slug": "lamp", "price": "1.00", "stock": 1}],
+        format="json",
+    )
+    assert response.status_code == 400
+    assert response.data["errors"]["0"] == {
+        "id": ["Unknown field."],
+        "slug": ["product with this slug already exists."],
+    }
+
+    # Desk is in the batch but keeps its slug, so "desk" is still taken.
+    response = client.patch(
+        "/api/products/-/bulk/",
+        [{"id": str(lamp.id), "slug": "desk"}, {"id": str(desk.id), "stock": 3}],
+        format="json",
+    )
+    assert response.status_code == 400
+    assert response.data["errors"] == {"0": {"slug": ["product with this slug already exists."]}}
+
+    # Once Desk moves off it in the same batch, Lamp may take it.
+    serializer = ProductBulkUpdateSerializer(
+        many=True,
+        partial=True,
+        data=[{"id": str(desk.id), "name": "Standing Desk"}, {"id": str(lamp.id), "slug": "desk"}],
+    )
+    assert serializer.is_valid(), serializer.errors
+
+
+@pytest.mark.django_db
+def test_conflicts_that_slip_past_validation_name_the_failing_items():
+    chair = create_product(name="Chair", price=1, stock=1)
+    lamp = create_product(name="Lamp", price=1, stock=1)
+    create_product(name="Desk", price=1, stock=1)
+
+    # As if a concurrent writer had taken "desk" after validation.
+    with pytest.raises(BulkWriteConflict) as conflict:
+        bulk_update_products([(chair, {"stock": 2}), (lamp, {"slug": "desk"})])
+
+    assert conflict.value.indexes == [1]
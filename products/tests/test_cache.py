@@ -0,0 +1,44 @@
+import pytest
+from rest_framework.test import APIClient
+
+from core.cache import get_stats
+from products.services import create_product
+
+
+@pytest.mark.django_db
+def test_list_is_served_from_cache_until_a_product_is_written(django_assert_num_queries):
+    create_product(name="Camera", price=300, stock=2)
+    client = APIClient()
+    # The counters are per process and outlive each test.
+    before = get_stats()
+
+    first = client.get("/api/products/?ordering=price&page=1")
+    with django_assert_num_queries(0):
+        cached = client.get("/api/products/?page=1&ordering=price")
+    assert cached.data == first.data
+
+    create_product(name="Tripod", price=40, stock=9)
+
+    fresh = client.get("/api/products/?ordering=price&page=1")
+    assert fresh.data["count"] == 2
+    after = get_stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 2)
+
+
+@pytest.mark.django_db
+def test_detail_cache_is_invalidated_by_category_rename(django_assert_num_queries):
+    client = APIClient()
+    client.post("/api/categories/", {"name": "Audio"}, format="json")
+    client.post(
+        "/api/products/",
+        {"name": "Speaker", "price": "99.00", "stock": 1, "category": "audio"},
+        format="json",
+    )
+
+    client.get("/api/products/speaker/")
+    with django_assert_num_queries(0):
+        client.get("/api/products/speaker/")
+
+    client.patch("/api/categories/audio/", {"name": "Hi-Fi"}, format="json")
+
+    assert client.get("/api/products/speaker/").data["data"]["category_name"] == "Hi-Fi"
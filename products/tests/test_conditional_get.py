@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from categories.services import create_category
+from products.services import create_product, update_product
+
+
+@pytest.mark.django_db
+def test_detail_revalidates_with_a_single_query(django_assert_num_queries):
+    create_product(name="Headphones", price=150, stock=4)
+    client = APIClient()
+
+    response = client.get("/api/products/headphones/")
+    assert response.status_code == 200
+    assert "Last-Modified" in response.headers
+
+    cache.clear()
+    with django_assert_num_queries(1):
+        revalidated = client.get(
+            "/api/products/headphones/", HTTP_IF_NONE_MATCH=response.headers["ETag"]
+        )
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == response.headers["ETag"]
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_on_update_and_soft_delete():
+    product = create_product(name="Router", price=80, stock=6)
+    client = APIClient()
+
+    etag = client.get("/api/products/").headers["ETag"]
+    assert client.get("/api/products/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    update_product(product, stock=5)
+    updated = client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+    assert updated.status_code == 200
+
+    client.delete("/api/products/router/")
+    deleted = client.get("/api/products/", HTTP_IF_NONE_MATCH=updated.headers["ETag"])
+    assert deleted.status_code == 200
+    assert deleted.data["results"]["data"][0]["is_active"] is False
+
+
+@pytest.mark.django_db
+def test_category_detail_honours_if_modified_since():
+    client = APIClient()
+    client.post("/api/categories/", {"name": "Garden"}, format="json")
+
+    response = client.get("/api/categories/garden/")
+    revalidated = client.get(
+        "/api/categories/garden/", HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"]
+    )
+
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?pagination=cursor"])
+def test_list_last_modified_follows_category_edits(query):
+    audio = create_category(name="Audio")
+    create_product(name="Speaker", price=80, stock=6, category=audio)
+    client = APIClient()
+    response = client.get(f"/api/products/{query}")
+
+    # A category edit that leaves every product row untouched.
+    Category.objects.filter(pk=audio.pk).update(updated_at=timezone.now() + timedelta(hours=1))
+    cache.clear()
+    revalidated = client.get(
+        f"/api/products/{query}", HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"]
+    )
+
+    assert revalidated.status_code == 200
+    assert revalidated.headers["Last-Modified"] != response.headers["Last-Modified"]
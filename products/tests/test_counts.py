@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products import selectors
+from products.services import create_product
+
+
+def _count_queries(ctx):
+    return [query["sql"] for query in ctx.captured_queries if "COUNT(" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_small_listings_report_an_exact_count():
+    for i in range(3):
+        create_product(name=f"Item {i}", price=i, stock=1)
+
+    response = APIClient().get("/api/products/?min_price=1")
+
+    assert (response.data["count"], response.data["count_exact"]) == (2, True)
+
+
+@pytest.mark.django_db
+def test_large_listings_report_the_estimate_without_counting(monkeypatch, settings):
+    settings.PRODUCT_COUNT_ESTIMATE_THRESHOLD = 100
+    monkeypatch.setattr(selectors, "estimate_count", lambda queryset: 50_000)
+    for i in range(3):
+        create_product(name=f"Item {i}", price=i, stock=1)
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/products/")
+
+    assert (response.data["count"], response.data["count_exact"]) == (50_000, False)
+    assert response.data["next"].endswith("?page=2")
+    assert not _count_queries(ctx)
+
+    # Pages past the real total are empty rather than 404.
+    assert client.get("/api/products/?page=3").data["results"]["data"] == []
+    for number in ("0", "abc", "1.5"):
+        assert client.get(f"/api/products/?page={number}").status_code == 404
+        assert client.get(f"/api/async/products/?page={number}").status_code == 404
+
+
+@pytest.mark.django_db
+def test_count_is_shared_across_pages_until_a_write():
+    for i in range(15):
+        create_product(name=f"Item {i}", price=i, stock=1)
+    client = APIClient()
+    client.get("/api/products/?is_active=true&ordering=price")
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get("/api/products/?is_active=true&page=2&fields=name")
+    assert second.data["count"] == 15
+    assert not _count_queries(ctx)
+
+    create_product(name="Item 15", price=15, stock=1)
+    assert client.get("/api/products/?is_active=true&page=2").data["count"] == 16
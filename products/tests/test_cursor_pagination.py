@@ -0,0 +1,80 @@
+import base64
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.services import create_product
+
+
+def _walk(client, url):
+    slugs = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        slugs.extend(item["slug"] for item in response.data["results"]["data"])
+        url = response.data["next"]
+    return slugs
+
+
+@pytest.mark.django_db
+def test_cursor_pages_follow_created_at_order_without_count():
+    products = [create_product(name=f"Item {i}", price=i, stock=1) for i in range(25)]
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/products/?pagination=cursor")
+
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+    assert not any("COUNT(" in query["sql"] for query in ctx.captured_queries)
+
+    expected = [p.slug for p in sorted(products, key=lambda p: (p.created_at, p.id), reverse=True)]
+    assert _walk(client, "/api/products/?pagination=cursor") == expected
+
+
+@pytest.mark.django_db
+def test_cursor_is_stable_across_inserts_and_soft_deletes():
+    for i in range(15):
+        create_product(name=f"Item {i}", price=i, stock=1)
+    client = APIClient()
+
+    first = client.get("/api/products/?pagination=cursor&ordering=price&is_active=true")
+    seen = [item["slug"] for item in first.data["results"]["data"]]
+
+    back = client.get(client.get(first.data["next"]).data["previous"])
+    assert [item["slug"] for item in back.data["results"]["data"]] == seen
+
+    create_product(name="Cheapest", price=0, stock=1)
+    doomed = client.get(first.data["next"]).data["results"]["data"][0]["slug"]
+    client.delete(f"/api/products/{doomed}/")
+
+    later = _walk(client, first.data["next"])
+
+    assert not set(seen) & set(later)
+    assert doomed not in later
+    assert len(seen) + len(later) == 14
+
+
+def _cursor(**payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404():
+    client = APIClient()
+    uuid = "00000000-0000-0000-0000-000000000000"
+    cases = [
+        ("-created_at", "not-a-cursor"),
+        ("-created_at", _cursor(o="-created_at", v="2026-01-01T00:00:00Z", id=5, r=False)),
+        ("price", _cursor(o="price", v="NaN", id=uuid, r=False)),
+        ("price", _cursor(o="price", v="Infinity", id=uuid, r=False)),
+    ]
+
+    for ordering, cursor in cases:
+        response = client.get(
+            f"/api/products/?pagination=cursor&ordering={ordering}&cursor={cursor}"
+        )
+        assert response.status_code == 404, cursor
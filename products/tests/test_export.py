@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.services import create_product
+
+
+@pytest.fixture
+def products():
+    return [create_product(name=f"Item {i}", price=i, stock=i) for i in range(7)]
+
+
+@pytest.mark.django_db
+def test_ndjson_export_streams_every_matching_row(products, settings):
+    settings.PRODUCT_EXPORT_CHUNK_SIZE = 3
+
+    response = APIClient().get("/api/products/-/export/?min_price=2&ordering=price")
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [f"Item {i}" for i in range(2, 7)]
+
+
+@pytest.mark.django_db
+def test_csv_export_honours_fields_and_search(products):
+    with CaptureQueriesContext(connection) as ctx:
+        response = APIClient().get(
+            "/api/products/-/export/?format=csv&fields=slug,price&search=item"
+        )
+        content = b"".join(response.streaming_content).decode()
+
+    assert response["Content-Disposition"] == 'attachment; filename="products.csv"'
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0] == ["slug", "price"]
+    assert sorted(rows[1:]) == [[f"item-{i}", f"{i}.00"] for i in range(7)]
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_fields():
+    response = APIClient().get("/api/products/-/export/?fields=secret")
+
+    assert response.status_code == 400
+    assert json.loads(response.content)["errors"] == {"fields": ["Unknown field(s): secret."]}
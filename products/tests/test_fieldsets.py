@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.services import create_product
+
+
+@pytest.mark.django_db
+def test_fields_trims_payload_and_skips_unused_columns():
+    create_product(name="Lamp", description="A very long description", price=25, stock=3)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = APIClient().get("/api/products/?fields=name,slug,price")
+
+    assert response.data["results"]["data"] == [{"name": "Lamp", "slug": "lamp", "price": "25.00"}]
+    page_query = ctx.captured_queries[-1]["sql"]
+    assert '"description"' not in page_query
+    assert '"categories_category"' not in page_query
+
+
+@pytest.mark.django_db
+def test_exclude_on_detail_keeps_category_columns_when_needed():
+    client = APIClient()
+    client.post("/api/categories/", {"name": "Lighting"}, format="json")
+    client.post(
+        "/api/products/",
+        {"name": "Lamp", "price": "25.00", "stock": 3, "category": "lighting"},
+        format="json",
+    )
+
+    data = client.get("/api/products/lamp/?exclude=description,image,thumbnail").data["data"]
+
+    assert "description" not in data and "image" not in data
+    assert (data["category"], data["category_name"]) == ("lighting", "Lighting")
+
+
+@pytest.mark.django_db
+def test_unknown_field_is_rejected_in_the_envelope():
+    response = APIClient().get("/api/products/?fields=name,secret")
+
+    assert response.status_code == 400
+    assert response.data == {"data": None, "errors": {"fields": ["Unknown field(s): secret."]}}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    ["/api/products/", "/api/async/products/", "/api/products/lamp/", "/api/products/-/export/"],
+)
+def test_empty_selection_is_rejected(url):
+    create_product(name="Lamp", price=25, stock=3)
+
+    response = APIClient().get(f"{url}?fields=id&exclude=id")
+
+    assert response.status_code == 400
+    # The export answers in its own format, so check the message only.
+    assert b"The selection leaves no fields." in response.content
@@ -0,0 +1,76 @@
+import json
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+
+from products.benchmarks import seed_catalog
+from products.loadmix import Targets, parse_mix, read_access_log, synthetic_requests
+
+LOG = """\
+10.0.0.1 - - [18/Oct/2026:10:00:00 +0000] "GET /api/products/?page=2 HTTP/1.1" 200 3780 "-" "-"
+10.0.0.1 - - [18/Oct/2026:10:00:01 +0000] "GET /api/products/?category=x&min_price=5 HTTP/1.1" 200
+10.0.0.1 - - [18/Oct/2026:10:00:02 +0000] "GET /api/products/?search=oak HTTP/1.1" 200 12 "-" "-"
+10.0.0.1 - - [18/Oct/2026:10:00:03 +0000] "GET /api/products/oak-lamp/ HTTP/1.1" 200 350 "-" "-"
+10.0.0.1 - - [18/Oct/2026:10:00:04 +0000] "POST /api/products/ HTTP/1.1" 201 350 "-" "-"
+10.0.0.1 - - [18/Oct/2026:10:00:05 +0000] "DELETE /api/products/oak-lamp/ HTTP/1.1" 204 0 "-" "-"
+not a request line
+"""
+
+
+def test_access_log_is_replayed_with_labels():
+    requests, skipped = read_access_log(LOG.splitlines(), category_slugs=["lighting"])
+
+    assert [(request.method, request.label) for request in requests] == [
+        ("GET", "list"),
+        ("GET", "filter"),
+        ("GET", "search"),
+        ("GET", "detail"),
+        ("POST", "create"),
+    ]
+    assert requests[0].path == "/api/products/?page=2"
+    assert json.loads(requests[-1].body)["category"] == "lighting"
+    assert skipped == 2
+
+
+@pytest.mark.django_db
+def test_synthetic_mix_is_seeded_and_weighted():
+    seed_catalog(100, categories=3)
+    targets = Targets.load()
+    mix = parse_mix("list=1,detail=3")
+
+    requests = synthetic_requests(targets, mix, 400, seed=1)
+
+    assert requests == synthetic_requests(targets, mix, 400, seed=1)
+    counts = Counter(request.label for request in requests)
+    assert set(counts) == {"list", "detail"}
+    assert counts["detail"] > 2 * counts["list"]
+
+
+@pytest.mark.parametrize("mode", ["asyncio", "threads"])
+def test_loadtest_reports_throughput_and_errors(live_server, capsys, mode):
+    seed_catalog(30, categories=2)
+
+    # The live server's threads share one in-memory SQLite connection, so
+    # requests must not overlap here.
+    call_command(
+        "loadtest",
+        "--url",
+        live_server.url,
+        "--requests",
+        "40",
+        "--concurrency",
+        "1",
+        "--warmup",
+        "0",
+        "--mode",
+        mode,
+        "--json",
+    )
+    summary = json.loads(capsys.readouterr().out)
+
+    assert summary["requests"] == 40
+    assert summary["error_rate"] == 0
+    assert set(summary["statuses"]) <= {"200", "201"}
+    assert summary["throughput_rps"] > 0
+    assert {"list", "detail"} <= set(summary["by_label"])
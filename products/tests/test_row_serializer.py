@@ -0,0 +1,83 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from categories.services import create_category
+from core.renderers import FastJSONRenderer
+from products.models import Product
+from products.selectors import get_products_queryset
+from products.serializers import ProductRowSerializer, ProductSerializer
+from products.services import create_product, update_product
+
+
+@pytest.fixture
+def catalogue(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    lighting = create_category(name="Éclairage & Lighting")
+    create_product(name="Desk Lamp", description=None, price="25.5", stock=3, category=lighting)
+    create_product(name="Plain", description="", price=0, stock=0)
+    create_product(name="Snowman ☃", description='line sep  "quoted"', price=9, stock=1)
+    photo = create_product(name="Photo", price="1234567.89", stock=2, category=lighting)
+    update_product(photo, image=SimpleUploadedFile("a b.jpg", b"not-an-image"), is_active=False)
+    Product.objects.filter(pk=photo.pk).update(
+        renditions={
+            "webp": [{"name": "thumbnails/a b_150.webp", "size": 150, "width": 150, "height": 90}],
+            "jpeg": [{"name": "thumbnails/a_150.jpg", "size": 150, "width": 150, "height": 90}],
+        }
+    )
+
+
+def _render_both(fields=None):
+    queryset = get_products_queryset()
+    expected = ProductSerializer(queryset, many=True, fields=fields).data
+
+    serializer = ProductRowSerializer.for_fields(fields)
+    actual = serializer.serialize(serializer.project(queryset))
+
+    return JSONRenderer().render(expected), FastJSONRenderer().render(actual)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "fields",
+    [
+        None,
+        ["name", "price"],
+        ["id", "category_name", "updated_at"],
+        ["category", "image", "thumbnail", "is_active", "description"],
+        ["srcset"],
+    ],
+)
+def test_row_serializer_output_is_byte_identical(catalogue, fields):
+    expected, actual = _render_both(fields)
+
+    assert actual == expected
+
+
+@pytest.mark.django_db
+def test_listing_response_matches_model_serializer(catalogue):
+    response = APIClient().get("/api/products/?ordering=price")
+
+    expected = ProductSerializer(get_products_queryset().order_by("price"), many=True).data
+    envelope = {
+        "count": 4,
+        "count_exact": True,
+        "next": None,
+        "previous": None,
+        "results": {"data": expected, "errors": None},
+    }
+
+    assert response.content == JSONRenderer().render(envelope)
+
+
+@pytest.mark.parametrize(
+    "name", ["products/a_b.jpg", "products/ä b.jpg", "products/../x.jpg", "products/a:b.jpg"]
+)
+def test_file_urls_match_storage(name):
+    row = dict.fromkeys(ProductRowSerializer.for_fields(["image"]).columns)
+    row["image"] = name
+
+    data = ProductRowSerializer.for_fields(["image"]).to_representation(row)
+
+    assert data == {"image": Product._meta.get_field("image").storage.url(name)}
@@ -0,0 +1,31 @@
+import pytest
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search import search_products
+from products.services import create_product, update_product
+
+
+@pytest.mark.django_db
+def test_search_ranks_name_matches_above_description_matches():
+    create_product(name="Leather Wallet", description="Fits every phone case", price=10, stock=1)
+    create_product(name="Phone Stand", description="Aluminium", price=20, stock=1)
+    create_product(name="Desk Lamp", description="Warm light", price=30, stock=1)
+
+    response = APIClient().get("/api/products/?search=phone")
+
+    names = [item["name"] for item in response.data["results"]["data"]]
+    assert names == ["Phone Stand", "Leather Wallet"]
+    assert response.data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes_and_matches_prefixes():
+    product = create_product(name="Mechanical Keyboard", price=80, stock=3)
+
+    assert list(search_products(Product.objects.all(), "keyb")) == [product]
+
+    update_product(product, name="Optical Mouse")
+
+    assert not search_products(Product.objects.all(), "keyboard").exists()
+    assert list(search_products(Product.objects.all(), "mouse optic")) == [product]
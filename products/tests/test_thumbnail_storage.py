@@ -0,0 +1,98 @@
+import os
+import tracemalloc
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from products.models import Product
+from products.services import create_product
+from products.tasks import generate_thumbnail
+from products.tests.storages import ObjectStorage
+
+
+@pytest.fixture
+def object_storage(settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {"BACKEND": "products.tests.storages.ObjectStorage"},
+    }
+    settings.THUMBNAIL_SIZES = [150, 300]
+    settings.THUMBNAIL_FORMATS = ["jpeg", "webp"]
+    ObjectStorage.reset()
+    yield ObjectStorage
+    ObjectStorage.reset()
+
+
+def _product_with(image_bytes, name="upload.jpg"):
+    product = create_product(name="Lamp", price=10, stock=1)
+    product.image.save(name, ContentFile(image_bytes), save=False)
+    Product.objects.filter(pk=product.pk).update(image=product.image.name)
+    return product
+
+
+def _noise_jpeg(size):
+    buffer = BytesIO()
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(
+        buffer, format="JPEG", quality=95
+    )
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db
+def test_renditions_are_read_and_written_through_storage(object_storage):
+    product = _product_with(_noise_jpeg((1600, 1200)))
+
+    assert generate_thumbnail(str(product.id)) == "Thumbnail generated"
+
+    product.refresh_from_db()
+    names = [entry["name"] for entries in product.renditions.values() for entry in entries]
+    assert len(names) == 4 and all(name in object_storage.objects for name in names)
+    assert product.thumbnail.url.startswith("https://objects.example/thumbnails/")
+
+
+@pytest.mark.django_db
+def test_source_is_streamed_not_buffered(object_storage):
+    source = _noise_jpeg((3000, 2000))
+    product = _product_with(source)
+
+    tracemalloc.start()
+    try:
+        generate_thumbnail(str(product.id))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Python-side allocations stay well under one copy of the upload.
+    assert peak < len(source) / 2
+
+
+@pytest.mark.django_db
+def test_pixel_budget_is_checked_on_the_header(object_storage, settings):
+    settings.THUMBNAIL_MAX_PIXELS = 100_000
+    buffer = BytesIO()
+    Image.new("RGB", (2000, 2000)).save(buffer, format="PNG")
+    product = _product_with(buffer.getvalue(), "huge.png")
+
+    result = generate_thumbnail(str(product.id))
+
+    assert result.startswith("Image rejected: 2000x2000")
+    assert object_storage.bytes_read[product.image.name] < 64 * 1024
+    assert Product.objects.get(pk=product.pk).renditions == {}
+
+
+@pytest.mark.django_db
+def test_byte_budget_skips_without_reading(object_storage, settings):
+    settings.THUMBNAIL_MAX_BYTES = 1024
+    product = _product_with(_noise_jpeg((200, 200)))
+
+    assert generate_thumbnail(str(product.id)).startswith("Image rejected")
+    assert object_storage.bytes_read[product.image.name] == 0
+
+
+@pytest.mark.django_db
+def test_non_images_are_rejected_without_retrying(object_storage):
+    product = _product_with(b"not an image", "broken.jpg")
+
+    assert generate_thumbnail(str(product.id)).startswith("Image rejected")
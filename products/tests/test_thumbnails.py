@@ -0,0 +1,79 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image, JpegImagePlugin
+from rest_framework.test import APIClient
+
+from products import renditions
+from products.services import create_product, update_product
+from products.tasks import generate_thumbnail
+
+
+def _photo(size=(2400, 1600), format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 80, 40)).save(buffer, format=format)
+    return SimpleUploadedFile(f"photo.{format.lower()}", buffer.getvalue())
+
+
+@pytest.fixture
+def product(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.THUMBNAIL_SIZE = 300
+    settings.THUMBNAIL_SIZES = [150, 300]
+    settings.THUMBNAIL_FORMATS = ["jpeg", "webp"]
+    product = create_product(name="Lamp", price=10, stock=1)
+    return update_product(product, image=_photo())
+
+
+@pytest.mark.django_db
+def test_renditions_are_recorded_per_format_and_size(product):
+    generate_thumbnail(str(product.id))
+    product.refresh_from_db()
+
+    assert {
+        name: [(e["size"], e["width"], e["height"]) for e in entries]
+        for name, entries in product.renditions.items()
+    } == {
+        "jpeg": [(150, 150, 100), (300, 300, 200)],
+        "webp": [(150, 150, 100), (300, 300, 200)],
+    }
+    assert product.thumbnail.name == product.renditions["jpeg"][1]["name"]
+    with Image.open(product.thumbnail) as thumbnail:
+        assert (thumbnail.format, thumbnail.size) == ("JPEG", (300, 200))
+
+    assert generate_thumbnail(str(product.id)) == "Thumbnail already exists"
+
+
+@pytest.mark.django_db
+def test_srcset_lists_every_width(product):
+    generate_thumbnail(str(product.id))
+
+    data = APIClient().get(f"/api/products/{product.slug}/").data["data"]
+
+    assert list(data["srcset"]) == ["jpeg", "webp"]
+    assert [entry.split()[-1] for entry in data["srcset"]["webp"].split(", ")] == ["150w", "300w"]
+
+
+def test_jpeg_is_decoded_at_reduced_scale(monkeypatch):
+    decoded = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def spy(self, mode, size):
+        result = draft(self, mode, size)
+        decoded.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", spy)
+
+    rendered = renditions.render(_photo((4000, 3000)), [150, 300], ["jpeg"], quality=80)
+
+    # 2x the largest box is 600px, so the 4000x3000 source decodes at 1/4 scale.
+    assert decoded == [(1000, 750)]
+    assert [(r.width, r.height) for r in rendered] == [(150, 113), (300, 225)]
+
+
+def test_formats_pillow_cannot_encode_are_skipped(monkeypatch):
+    monkeypatch.setattr(renditions.features, "check", lambda feature: feature != "avif")
+
+    assert renditions.available_formats(["avif", "jpeg", "bogus", "webp"]) == ["jpeg", "webp"]
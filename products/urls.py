@@ -1,8 +1,17 @@
 from django.urls import path
 
-from .views import ProductDetailAPIView, ProductListCreateAPIView
+from .views import (
+    ProductBulkAPIView,
+    ProductDetailAPIView,
+    ProductExportAPIView,
+    ProductListCreateAPIView,
+)
 
+# Collection actions live under "-/", which no product slug can equal, so they
+# never shadow a product's detail URL.
 urlpatterns = [
     path("", ProductListCreateAPIView.as_view(), name="product-list-create"),
+    path("-/bulk/", ProductBulkAPIView.as_view(), name="product-bulk"),
+    path("-/export/", ProductExportAPIView.as_view(), name="product-export"),
     path("<slug:slug>/", ProductDetailAPIView.as_view(), name="product-detail"),
 ]
@@ -1,23 +1,21 @@
-import uuid
-
-from slugify import slugify
+from core.slugs import allocate_slug, allocate_slugs
 
 from .models import Product
 
 
-def generate_unique_slug(name: str, instance=None) -> str:
-    base_slug = slugify(name)
-    slug = base_slug
+def _candidates(exclude):
+    return Product.objects.exclude(pk__in=exclude)
 
-    queryset = Product.objects.all()
 
-    if instance:
-        queryset = queryset.exclude(pk=instance.pk)
+def generate_unique_slug(name: str, instance=None) -> str:
+    exclude = [instance.pk] if instance else []
+    return allocate_slug(_candidates(exclude), name)
 
-    counter = 1
-    while queryset.filter(slug=slug).exists():
-        short_suffix = uuid.uuid4().hex[:6]
-        slug = f"{base_slug}-{short_suffix}"
-        counter += 1
 
-    return slug
+def generate_unique_slugs(names, exclude=(), reserved=()) -> list[str]:
+    """
+    One slug per name in a single query; ``exclude`` lists product pks whose
+    current slugs may be reused, ``reserved`` slugs the batch sets itself.
+    See core.slugs.allocate_slugs.
+    """
+    return allocate_slugs(_candidates(exclude), list(names), reserved=reserved)
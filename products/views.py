@@ -1,34 +1,78 @@
 import django_filters
+from django.conf import settings
+from django.db.models import Max
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import filters, serializers, status
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from categories.models import Category
+from core.cache import cached_response, get_generation, normalize_params
+from core.conditional import make_etag
+from core.renderers import FastJSONRenderer
+
 from .models import Product
-from .selectors import get_products_queryset
-from .serializers import ProductSerializer, ProductWriteSerializer
+from .pagination import ProductCursorPagination, ProductPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .search import ProductSearchFilter
+from .selectors import get_products_queryset, project_products
+from .serializers import (
+    ProductBulkCreateSerializer,
+    ProductBulkUpdateSerializer,
+    ProductRowSerializer,
+    ProductSerializer,
+    ProductWriteSerializer,
+    get_requested_fields,
+)
+from .services import (
+    CACHE_NAMESPACE,
+    BulkWriteConflict,
+    bulk_create_products,
+    bulk_update_products,
+    soft_delete_product,
+)
 
 
 class ProductFilter(django_filters.FilterSet):
     min_price = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
     max_price = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    category = django_filters.ModelChoiceFilter(
+        queryset=Category.objects.live(), method="filter_category"
+    )
+    # ?category=<id>&include_descendants=true widens the category to its subtree.
+    include_descendants = django_filters.BooleanFilter(method="filter_include_descendants")
 
     class Meta:
         model = Product
         fields = ["category", "is_active"]
 
+    def filter_category(self, queryset, name, value):
+        if self.form.cleaned_data.get("include_descendants"):
+            # Left to filter_include_descendants.
+            return queryset
+        return queryset.filter(category=value)
+
+    def filter_include_descendants(self, queryset, name, value):
+        category = self.form.cleaned_data.get("category")
+        if not value or category is None:
+            return queryset
+        # The subtree is one prefix range of the path index, resolved in a subquery.
+        subtree = Category.objects.filter(path__startswith=category.path).values("pk")
+        return queryset.filter(category__in=subtree)
 
-class ProductPagination(PageNumberPagination):
-    page_size = 10
 
+class ProductQueryMixin:
+    """Queryset and ``?category=&search=&ordering=`` filtering shared by product listings."""
 
-class ProductListCreateAPIView(APIView):
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        ProductSearchFilter,
         filters.OrderingFilter,
     ]
 
@@ -36,8 +80,6 @@ class ProductListCreateAPIView(APIView):
     search_fields = ["name", "description"]
     ordering_fields = ["price", "created_at"]
 
-    pagination_class = ProductPagination
-
     def get_queryset(self):
         return get_products_queryset()
 
@@ -46,6 +88,81 @@ class ProductListCreateAPIView(APIView):
             queryset = backend().filter_queryset(request, queryset, self)
         return queryset
 
+
+class ProductListMixin(ProductQueryMixin):
+    """Pagination, payload and validators of the product listing, sync and async."""
+
+    pagination_class = ProductPagination
+    cursor_pagination_class = ProductCursorPagination
+
+    def get_paginator(self, request):
+        # Keyset mode is opt-in: ?pagination=cursor, or any request carrying a cursor.
+        params = request.query_params
+        if (
+            params.get("pagination") == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in params
+        ):
+            return self.cursor_pagination_class()
+        return self.pagination_class()
+
+    def get_list_validators(self, request, params):
+        queryset = self.filter_queryset(request, self.get_queryset())
+        # The generation covers category renames, which change the payload
+        # without touching any product's updated_at.
+        generation = get_generation(CACHE_NAMESPACE)
+
+        paginator = self.get_paginator(request)
+        if isinstance(paginator, ProductCursorPagination):
+            # Keyset pages skip COUNT, so validate against this page's rows only.
+            rows = paginator.paginate_queryset(
+                queryset.values("id", "updated_at", "category__updated_at", "created_at", "price"),
+                request,
+            )
+            # Like the detail view, a category edit counts as a change to its products.
+            stamps = [row["updated_at"] for row in rows]
+            stamps += [row["category__updated_at"] for row in rows if row["category__updated_at"]]
+            last_modified = max(stamps, default=None)
+            etag = make_etag(
+                "product-page",
+                generation,
+                params,
+                paginator.has_next,
+                paginator.has_previous,
+                *((row["id"], row["updated_at"]) for row in rows),
+            )
+            return etag, last_modified
+
+        # Same (cached) count the page will report, so a miss pays for it once.
+        count, _ = paginator.get_count(queryset, request)
+        # Joining categories here would scan every matching product; the newest
+        # category edit overall is an upper bound read off its index instead.
+        stamps = [
+            queryset.aggregate(last_modified=Max("updated_at"))["last_modified"],
+            Category.objects.aggregate(last_modified=Max("updated_at"))["last_modified"],
+        ]
+        last_modified = max(filter(None, stamps), default=None)
+        etag = make_etag("product-list", generation, params, last_modified, count)
+        return etag, last_modified
+
+    def build_list_payload(self, request, fields=None):
+        queryset = self.get_queryset()
+        queryset = self.filter_queryset(request, queryset)
+
+        # Listings read values() rows straight into dicts; see ProductRowSerializer.
+        serializer = ProductRowSerializer.for_fields(fields)
+
+        paginator = self.get_paginator(request)
+        paginator.project = serializer.project
+        page = paginator.paginate_queryset(queryset, request)
+
+        data = serializer.serialize(page)
+
+        return paginator.get_paginated_response({"data": data, "errors": None}).data
+
+
+class ProductListCreateAPIView(ProductListMixin, APIView):
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
     @extend_schema(
         summary="List Products",
         responses={
@@ -59,15 +176,24 @@ class ProductListCreateAPIView(APIView):
         },
     )
     def get(self, request):
-        queryset = self.get_queryset()
-        queryset = self.filter_queryset(request, queryset)
-
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(queryset, request)
-
-        serializer = ProductSerializer(page, many=True)
+        try:
+            fields = get_requested_fields(request.query_params)
+        except serializers.ValidationError as exc:
+            return Response(
+                {"data": None, "errors": exc.detail},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return paginator.get_paginated_response({"data": serializer.data, "errors": None})
+        params = normalize_params(request.query_params)
+        return cached_response(
+            request,
+            CACHE_NAMESPACE,
+            "list",
+            # Pagination links are absolute, so the host is part of the key.
+            [("host", request.get_host()), *params],
+            build=lambda: self.build_list_payload(request, fields),
+            validators=lambda: self.get_list_validators(request, params),
+        )
 
     @extend_schema(
         summary="Create Product",
@@ -105,13 +231,148 @@ class ProductListCreateAPIView(APIView):
         )
 
 
-class ProductDetailAPIView(APIView):
+class ProductExportAPIView(ProductQueryMixin, APIView):
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    @extend_schema(
+        summary="Export Products",
+        description="Streams every matching product as NDJSON (default) or ?format=csv.",
+        responses={200: OpenApiTypes.STR},
+    )
+    def get(self, request):
+        try:
+            fields = get_requested_fields(request.query_params)
+        except serializers.ValidationError as exc:
+            return Response(
+                {"data": None, "errors": exc.detail},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = ProductRowSerializer.for_fields(fields)
+        queryset = serializer.project(self.filter_queryset(request, self.get_queryset()))
+
+        # iterator() streams through a server-side cursor on PostgreSQL, so
+        # memory stays flat however many rows match.
+        chunk_size = settings.PRODUCT_EXPORT_CHUNK_SIZE
+        rows = queryset.iterator(chunk_size=chunk_size)
+        tz = timezone.get_current_timezone()
+        items = (serializer.to_representation(row, tz) for row in rows)
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(items, serializer.fields, batch_size=chunk_size),
+            content_type=renderer.media_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="products.{renderer.format}"'
+        return response
+
+
+class ProductBulkAPIView(APIView):
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_serializer(self, serializer_class, **kwargs):
+        return serializer_class(
+            many=True,
+            allow_empty=False,
+            max_length=settings.PRODUCT_BULK_MAX_ITEMS,
+            **kwargs,
+        )
 
+    def error_response(self, serializer):
+        errors = serializer.errors
+        if isinstance(errors, list):
+            # Only the failing items, keyed by their position in the request.
+            errors = {str(index): item for index, item in enumerate(errors) if item}
+        return Response({"data": None, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    def conflict_response(self, exc):
+        # Validation passed, so a concurrent writer took a slug meanwhile.
+        errors = {
+            str(index): {"slug": ["product with this slug already exists."]}
+            for index in exc.indexes
+        } or {"non_field_errors": ["The batch conflicts with concurrent changes; retry it."]}
+        return Response({"data": None, "errors": errors}, status=status.HTTP_409_CONFLICT)
+
+    @extend_schema(
+        summary="Bulk Create Products",
+        request=ProductBulkCreateSerializer(many=True),
+        responses={
+            201: inline_serializer(
+                name="ProductBulkCreateResponse",
+                fields={
+                    "data": ProductSerializer(many=True),
+                    "errors": serializers.DictField(allow_null=True, required=False),
+                },
+            )
+        },
+    )
+    def post(self, request):
+        serializer = self.get_serializer(ProductBulkCreateSerializer, data=request.data)
+        if not serializer.is_valid():
+            return self.error_response(serializer)
+
+        try:
+            products = bulk_create_products(serializer.validated_data)
+        except BulkWriteConflict as exc:
+            return self.conflict_response(exc)
+        return Response(
+            {"data": ProductSerializer(products, many=True).data, "errors": None},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        summary="Bulk Update Products",
+        request=ProductBulkUpdateSerializer(many=True),
+        responses={
+            200: inline_serializer(
+                name="ProductBulkUpdateResponse",
+                fields={
+                    "data": ProductSerializer(many=True),
+                    "errors": serializers.DictField(allow_null=True, required=False),
+                },
+            )
+        },
+    )
+    def patch(self, request):
+        serializer = self.get_serializer(
+            ProductBulkUpdateSerializer, data=request.data, partial=True
+        )
+        if not serializer.is_valid():
+            return self.error_response(serializer)
+
+        instances = serializer.instances
+        changes = [(instances[item.pop("id")], item) for item in serializer.validated_data]
+        try:
+            products = bulk_update_products(changes)
+        except BulkWriteConflict as exc:
+            return self.conflict_response(exc)
+        return Response({"data": ProductSerializer(products, many=True).data, "errors": None})
+
+
+class ProductDetailMixin:
     def get_queryset(self):
         return get_products_queryset().filter(is_active=True)
 
-    def get_object(self, slug):
-        queryset = self.get_queryset()
+    def get_validators(self, slug, params):
+        row = (
+            self.get_queryset()
+            .filter(slug=slug)
+            .values_list("id", "updated_at", "category__updated_at")
+            .first()
+        )
+        if row is None:
+            return None
+
+        pk, updated_at, category_updated_at = row
+        last_modified = max(filter(None, (updated_at, category_updated_at)))
+        return make_etag("product", pk, updated_at, category_updated_at, params), last_modified
+
+
+class ProductDetailAPIView(ProductDetailMixin, APIView):
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_object(self, slug, fields=None):
+        queryset = project_products(self.get_queryset(), fields)
         return get_object_or_404(queryset, slug=slug)
 
     @extend_schema(
@@ -127,10 +388,26 @@ class ProductDetailAPIView(APIView):
         },
     )
     def get(self, request, slug):
-        product = self.get_object(slug)
-        serializer = ProductSerializer(product)
+        try:
+            fields = get_requested_fields(request.query_params)
+        except serializers.ValidationError as exc:
+            return Response(
+                {"data": None, "errors": exc.detail},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return Response({"data": serializer.data, "errors": None})
+        params = normalize_params(request.query_params)
+        return cached_response(
+            request,
+            CACHE_NAMESPACE,
+            "detail",
+            [("slug", slug), *params],
+            build=lambda: {
+                "data": ProductSerializer(self.get_object(slug, fields), fields=fields).data,
+                "errors": None,
+            },
+            validators=lambda: self.get_validators(slug, params),
+        )
 
     @extend_schema(
         summary="Update Product",
@@ -213,8 +490,7 @@ class ProductDetailAPIView(APIView):
     )
     def delete(self, request, slug):
         product = self.get_object(slug)
-        product.is_active = False
-        product.save(update_fields=["is_active"])
+        soft_delete_product(product)
 
         return Response(
             {